@@ -24,6 +24,8 @@ provided it will be loaded in the first tab on startup.
 
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures
 import sys
 import urllib.parse
 import tkinter
@@ -37,8 +39,8 @@ import os
 import pandas as pd
 
 from . import stats
-from .networking import URL, COOKIE_JAR
-from .dom import Text, Element, HTMLParser, tree_to_list
+from .networking import URL, COOKIE_JAR, fetch_all
+from .dom import Text, Element, HTMLParser, mark_mutated, tree_to_list
 from .css import (
     CSSParser,
     cascade_priority,
@@ -46,6 +48,7 @@ from .css import (
     INHERITED_PROPERTIES,
     style,
 )
+from . import layout as _layout_module
 from .layout import (
     DocumentLayout,
     Rect,
@@ -90,6 +93,8 @@ class Tab:
         self.nodes: Any = None
         self.document: Optional[DocumentLayout] = None
         self.display_list: List[Any] = []
+        # False when the display list no longer reflects the DOM state
+        self._dl_valid: bool = False
         self.scroll: int = 0
         self.doc_height: int = HEIGHT
         self.title: str = "New Tab"
@@ -268,6 +273,7 @@ class Tab:
         self.document.layout()
         self.display_list = []
         paint_tree(self.document, self.display_list)
+        self._dl_valid = True
         # Document height for scrollbar calculations
         self.doc_height = self.document.height
         # Ensure scroll value is within range
@@ -330,10 +336,12 @@ class Tab:
                         elt.attributes["_checked_state"] = "false"
                     else:
                         elt.attributes["_checked_state"] = "true"
+                    mark_mutated(elt)
                     self.apply_styles_and_render()
                     return
                 # Text input: clear value and focus
                 elt.attributes["value"] = ""
+                mark_mutated(elt)
                 self.focus = elt
                 elt.is_focused = True
                 self.apply_styles_and_render()
@@ -346,8 +354,10 @@ class Tab:
                 if form:
                     self.submit_form(form)
                     return
-        # Default: re‑render page without action
-        self.apply_styles_and_render()
+        # Default: no action; re‑render only if the page went stale (e.g.
+        # an input lost focus)
+        if not self._dl_valid:
+            self.apply_styles_and_render()
 
     def keypress(self, char: str) -> None:
         """Handle a character key press on a focused input element."""
@@ -362,7 +372,7 @@ class Tab:
             except Exception:
                 prevent = False
         if prevent:
-            self.apply_styles_and_render()
+            self.apply_styles_and_render(defer_draw=True)
             return
         # Input type determines behaviour
         node = self.focus
@@ -374,7 +384,8 @@ class Tab:
         if char == "\b":
             raw = node.attributes.get("value", "")
             node.attributes["value"] = raw[:-1]
-            self.apply_styles_and_render()
+            mark_mutated(node)
+            self.apply_styles_and_render(defer_draw=True)
             return
         # Enter submits enclosing form
         if char in ("\r", "\n"):
@@ -386,7 +397,8 @@ class Tab:
             return
         # Append typed character to input value
         node.attributes["value"] = node.attributes.get("value", "") + char
-        self.apply_styles_and_render()
+        mark_mutated(node)
+        self.apply_styles_and_render(defer_draw=True)
 
     def allowed_request(self, url: URL) -> bool:
         """Check whether a request is allowed under the current CSP."""
@@ -403,8 +415,19 @@ class Tab:
         if not self.nodes:
             return
         new_loaded_styles: Dict[object, List] = {}
+        nodes = tree_to_list(self.nodes, [])
+        prefetched = self._prefetch_subresources(nodes)
+
+        def fetch(url: URL, ref: Optional[str], origin: Optional[str]) -> tuple:
+            result = prefetched.get(str(url))
+            if result is None:
+                return url.request(referrer=ref, payload=None, origin=origin)
+            if isinstance(result, BaseException):
+                raise result
+            return result
+
         # Traverse all nodes in preorder
-        for node in tree_to_list(self.nodes, []):
+        for node in nodes:
             if isinstance(node, Element):
                 # <script src="…"> external scripts
                 if node.tag == "script" and "src" in node.attributes:
@@ -421,7 +444,7 @@ class Tab:
                             try:
                                 ref = str(self.url) if self.url else None
                                 origin = self.url.origin() if self.url else None
-                                h, body = script_url.request(referrer=ref, payload=None, origin=origin)
+                                h, body = fetch(script_url, ref, origin)
                                 try:
                                     self.js.run(body) if self.js else None
                                 except Exception:
@@ -446,7 +469,7 @@ class Tab:
                             try:
                                 ref = str(self.url) if self.url else None
                                 origin_header = self.url.origin() if self.url else None
-                                h, css_body = css_url.request(referrer=ref, payload=None, origin=origin_header)
+                                h, css_body = fetch(css_url, ref, origin_header)
                                 parser = CSSParser(css_body)
                                 rules = parser.parse()
                             except Exception:
@@ -461,8 +484,70 @@ class Tab:
             extra.extend(rules)
         self.extra_style_rules = extra
 
-    def apply_styles_and_render(self) -> None:
-        """Apply CSS styles and compute layout/display list."""
+    def _prefetch_subresources(self, nodes: List[Any]) -> Dict[str, Any]:
+        """Fetch the page's pending external scripts and stylesheets concurrently.
+
+        Only resources that process_scripts_and_styles is about to request
+        are fetched. Scripts still run one at a time, in document order.
+        Collection stops at the first script that will run: it may set
+        ``document.cookie``, so everything after it is left to the
+        sequential loader and is requested with those cookies.
+
+        :returns: A map from URL string to a ``(headers, body)`` tuple or
+                  the exception raised for that URL. Empty when fewer than
+                  two resources are pending; a single fetch goes through
+                  the pooled synchronous path instead.
+        """
+        pending: Dict[str, URL] = {}
+        for node in nodes:
+            if not isinstance(node, Element):
+                continue
+            if node.tag == "script" and "src" in node.attributes:
+                if not self.js or node.attributes["src"] in self.loaded_scripts:
+                    continue
+                src = node.attributes["src"]
+            elif (node.tag == "link" and node.attributes.get("rel", "").casefold() == "stylesheet"
+                    and "href" in node.attributes and node not in self.loaded_styles):
+                src = node.attributes["href"]
+            else:
+                continue
+            try:
+                url = self.url.resolve(src) if self.url else URL(src)
+            except Exception:
+                continue
+            if self.allowed_request(url):
+                pending.setdefault(str(url), url)
+                if node.tag == "script":
+                    break
+        if len(pending) < 2:
+            return {}
+        ref = str(self.url) if self.url else None
+        origin = self.url.origin() if self.url else None
+        urls = list(pending.values())
+
+        def run() -> List[Any]:
+            return asyncio.run(fetch_all(urls, referrer=ref, origin=origin))
+
+        try:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                results = run()
+            else:
+                # Inside a running loop (e.g. a notebook kernel) asyncio.run
+                # is not allowed, so run the fetches on a worker thread's loop
+                with concurrent.futures.ThreadPoolExecutor(1) as executor:
+                    results = executor.submit(run).result()
+        except Exception:
+            return {}
+        return dict(zip(pending.keys(), results))
+
+    def apply_styles_and_render(self, defer_draw: bool = False) -> None:
+        """Apply CSS styles and compute layout/display list.
+
+        With ``defer_draw`` the canvas redraw is scheduled through
+        Browser.request_draw, so bursts of keystrokes share one draw.
+        """
         if not self.nodes:
             return
         # Compose style rules from default sheet and external sheets
@@ -473,7 +558,10 @@ class Tab:
         # If this tab is active, redraw the canvas
         if self is self.browser.current_tab():
             try:
-                self.browser.draw()
+                if defer_draw:
+                    self.browser.request_draw()
+                else:
+                    self.browser.draw()
             except Exception:
                 pass
 
@@ -489,6 +577,7 @@ class Tab:
         """Clear the current focus within this tab and unfocus any input."""
         if self.focus:
             self.focus.is_focused = False
+            self._dl_valid = False
         self.focus = None
 
     def submit_form(self, form_elt: Element) -> None:
@@ -537,19 +626,23 @@ class Chrome:
         self.focus: Optional[str] = None
         self.bottom: int = 0
 
+    TAB_LEFT = 6
+    TAB_STRIDE = 140
+    TAB_WIDTH = 128
+
     def tab_rect(self, i: int) -> Rect:
-        x0 = 6 + i * 140
-        return Rect(x0, 2, x0 + 128, 28)
+        x0 = self.TAB_LEFT + i * self.TAB_STRIDE
+        return Rect(x0, 2, x0 + self.TAB_WIDTH, 28)
 
     def draw(self) -> None:
         pass
 
     def click(self, x: float, y: float) -> None:
-        for i in range(len(self.browser.tabs)):
-            r = self.tab_rect(i)
-            if r.contains_point(x, y):
-                self.browser.switch_tab(i)
-                return
+        # Tabs sit at a fixed stride, so the candidate index is computed
+        # directly instead of testing every tab's rectangle
+        i = int((x - self.TAB_LEFT) // self.TAB_STRIDE)
+        if 0 <= i < len(self.browser.tabs) and self.tab_rect(i).contains_point(x, y):
+            self.browser.switch_tab(i)
 
     def keypress(self, char: str) -> bool:
         if self.focus == "address bar":
@@ -568,19 +661,31 @@ class Browser:
     """Main browser window managing tabs, UI and event dispatch."""
     # Class‑level list of widget hit boxes: (Rect, Element)
     _widget_boxes: List[tuple[Rect, Element]] = []
+    # Vertical bucket index → indices into _widget_boxes overlapping it,
+    # in registration order, so hit tests only check nearby boxes
+    _widget_grid: Dict[int, List[int]] = {}
+    WIDGET_BUCKET = 64
 
     @classmethod
     def _register_widget_box(cls, element: Element, rect_tuple: tuple[float, float, float, float]) -> None:
         x1, y1, x2, y2 = rect_tuple
+        index = len(cls._widget_boxes)
         cls._widget_boxes.append((Rect(x1, y1, x2, y2), element))
+        grid = cls._widget_grid
+        for bucket in range(int(y1 // cls.WIDGET_BUCKET), int(y2 // cls.WIDGET_BUCKET) + 1):
+            grid.setdefault(bucket, []).append(index)
 
     @classmethod
     def _clear_widget_boxes(cls) -> None:
         cls._widget_boxes = []
+        cls._widget_grid = {}
 
     @classmethod
     def _hit_widget(cls, x: float, y: float) -> Optional[Element]:
-        for r, elt in reversed(cls._widget_boxes):
+        # Later boxes win, as they are painted on top
+        boxes = cls._widget_boxes
+        for index in reversed(cls._widget_grid.get(int(y // cls.WIDGET_BUCKET), ())):
+            r, elt = boxes[index]
             if r.contains_point(x, y):
                 return elt
         return None
@@ -621,8 +726,19 @@ class Browser:
         self._dragging_scroll: bool = False
         self._drag_offset: int = 0
         self.scrollbar_thumb: Optional[tuple[int, int, int, int]] = None
+        # Canvas item ids of the scrollbar track and thumb, reused across draws
+        self._scrollbar_items: Optional[tuple[int, Optional[int]]] = None
+        # Whether a coalesced draw() is already queued via after_idle
+        self._draw_pending: bool = False
         self._scroll_velocity: float = 0.0
         self._scroll_animating: bool = False
+        # Display list currently on the canvas and the scroll it was drawn at
+        self._drawn_list: Optional[List[Any]] = None
+        self._drawn_scroll: int = 0
+        # Page-space (top, bottom) band whose commands are on the canvas
+        self._drawn_band: tuple[float, float] = (0, 0)
+        # (titles, active index) the tab strip widgets were last built for
+        self._tab_strip_key: Optional[tuple] = None
         # Event bindings
         self.window.bind("<Return>", lambda e: self.handle_enter())
         self.window.bind("<Down>", lambda e: self.scroll_active(+SCROLL_STEP))
@@ -640,9 +756,6 @@ class Browser:
         self._bind_accels()
         # Create first tab with a default home page
         self.new_tab(URL("http://www.textfiles.com/"))
-        # Inject Browser into layout for hit testing
-        from . import layout as _layout_module  # local import to avoid circular dependency at import time
-        _layout_module.Browser = Browser
 
     # UI update methods
     def update_padlock(self) -> None:
@@ -697,21 +810,31 @@ class Browser:
         return self.tabs[self.active_tab_index]
 
     def _gather_text(self, node: Any) -> str:
-        """Recursively collect visible text from the DOM tree."""
-        out = ""
-        if isinstance(node, Text):
-            out += node.text
-        elif isinstance(node, Element):
-            # Determine if this element is block level to insert line breaks
-            is_block = node.tag in BLOCK_ELEMENTS or node.tag in ("br",)
-            for child in node.children:
-                out += self._gather_text(child)
-            if is_block:
-                out += "\n"
-        else:
-            for child in getattr(node, "children", []):
-                out += self._gather_text(child)
-        return out
+        """Collect visible text from the DOM tree.
+
+        Block-level elements and ``<br>`` are followed by a line break;
+        the contents of ``<script>`` and ``<style>`` are skipped.
+        """
+        parts: List[str] = []
+        append = parts.append
+        # Stack of nodes still to visit and pending "\n" strings to emit
+        # once a block element's children are done
+        stack: List[Any] = [node]
+        pop = stack.pop
+        while stack:
+            item = pop()
+            if isinstance(item, str):
+                append(item)
+            elif isinstance(item, Text):
+                append(item.text)
+            else:
+                if isinstance(item, Element):
+                    if item.tag in ("script", "style"):
+                        continue
+                    if item.tag in BLOCK_ELEMENTS or item.tag == "br":
+                        stack.append("\n")
+                stack.extend(reversed(getattr(item, "children", [])))
+        return "".join(parts)
 
     def new_tab(self, url: URL) -> None:
         tab = Tab(self)
@@ -754,12 +877,20 @@ class Browser:
         self.draw()
 
     def refresh_tab_strip(self) -> None:
+        titles = []
+        for t in self.tabs:
+            title = t.title or "New Tab"
+            titles.append(title[:24] + ("…" if len(title) > 24 else ""))
+        # Rebuilding the Tk widgets is comparatively slow; skip it when
+        # nothing visible in the strip has changed
+        key = (tuple(titles), self.active_tab_index)
+        if key == self._tab_strip_key:
+            return
+        self._tab_strip_key = key
         for w in self.tabbar.winfo_children():
             w.destroy()
-        for i, t in enumerate(self.tabs):
+        for i, title_txt in enumerate(titles):
             cell = tkinter.Frame(self.tabbar, bd=0, relief="flat", bg="#e6e6e6")
-            title = t.title or "New Tab"
-            title_txt = title[:24] + ("…" if len(title) > 24 else "")
             b = tkinter.Button(
                 cell,
                 text=title_txt,
@@ -789,7 +920,7 @@ class Browser:
                     new_y = max(0, min(e.y - thumb_h // 2, HEIGHT - thumb_h))
                     ratio = new_y / (HEIGHT - thumb_h)
                     tab.scroll = int(ratio * (tab.doc_height - HEIGHT))
-                    self.draw()
+                    self.request_draw()
             return
         # Clear selection and blur address bar
         try:
@@ -816,7 +947,7 @@ class Browser:
         new_y = max(0, min(e.y - self._drag_offset, HEIGHT - thumb_h))
         ratio = new_y / (HEIGHT - thumb_h)
         tab.scroll = int(ratio * (tab.doc_height - HEIGHT))
-        self.draw()
+        self.request_draw()
 
     def handle_release(self, e: Any) -> None:
         self._dragging_scroll = False
@@ -830,7 +961,6 @@ class Browser:
         self.chrome_ctl.focus = None
         if e.char:
             self.current_tab().keypress(e.char)
-            self.draw()
 
     def handle_enter(self) -> None:
         widget = self.window.focus_get()
@@ -871,7 +1001,7 @@ class Browser:
             tab.scrolldown(delta)
         else:
             tab.scrollup(-delta)
-        self.draw()
+        self.request_draw()
 
     def on_wheel(self, e: Any) -> None:
         # Normalize wheel delta to pixel scroll
@@ -904,25 +1034,74 @@ class Browser:
         self.window.after(16, self._scroll_tick)
 
     # Painting
+    def request_draw(self) -> None:
+        """Schedule a single draw() for the next time Tk is idle.
+
+        Bursts of scroll, drag and key events that arrive before then
+        are folded into one redraw.
+        """
+        if not self._draw_pending:
+            self._draw_pending = True
+            self.window.after_idle(self._idle_draw)
+
+    def _idle_draw(self) -> None:
+        self._draw_pending = False
+        self.draw()
+
     def draw(self) -> None:
         tab = self.current_tab()
-        self.canvas.delete("all")
-        for cmd in tab.display_list:
-            cmd.execute(tab.scroll, self.canvas)
+        band_top, band_bottom = self._drawn_band
+        if (tab.display_list is self._drawn_list
+                and band_top <= tab.scroll and tab.scroll + HEIGHT <= band_bottom):
+            # Same display list and the viewport is still inside the drawn
+            # band: shift the existing canvas items instead of recreating them
+            dy = self._drawn_scroll - tab.scroll
+            if dy:
+                self.canvas.move("content", 0, dy)
+        else:
+            # Only create items for a band one screen above and below the
+            # viewport; scrolling out of it triggers another redraw
+            band_top = tab.scroll - HEIGHT
+            band_bottom = tab.scroll + 2 * HEIGHT
+            self.canvas.delete("all")
+            self._scrollbar_items = None
+            for cmd in tab.display_list:
+                if cmd.bottom >= band_top and cmd.top <= band_bottom:
+                    cmd.execute(tab.scroll, self.canvas)
+            self.canvas.addtag_all("content")
+            self._drawn_list = tab.display_list
+            self._drawn_band = (band_top, band_bottom)
+        self._drawn_scroll = tab.scroll
         self.draw_scrollbar(tab)
 
     def draw_scrollbar(self, tab: Tab) -> None:
+        # The track and thumb items survive scroll-only draws; the thumb is
+        # repositioned in place rather than deleted and recreated
         track_left = WIDTH - SCROLLBAR_WIDTH
-        self.canvas.create_rectangle(track_left, 0, WIDTH, HEIGHT, width=0, fill="#f0f0f0")
+        if self._scrollbar_items is None:
+            track = self.canvas.create_rectangle(track_left, 0, WIDTH, HEIGHT, width=0, fill="#f0f0f0", tags="scrollbar")
+            self._scrollbar_items = (track, None)
+        track, thumb = self._scrollbar_items
         if tab.doc_height <= HEIGHT:
             self.scrollbar_thumb = None
+            if thumb is not None:
+                self.canvas.delete(thumb)
+                self._scrollbar_items = (track, None)
             return
         ratio = HEIGHT / tab.doc_height
         thumb_h = max(30, int(HEIGHT * ratio))
         max_scroll = tab.doc_height - HEIGHT
         thumb_y = int((tab.scroll / max_scroll) * (HEIGHT - thumb_h))
         self.scrollbar_thumb = (track_left, thumb_y, WIDTH, thumb_y + thumb_h)
-        self.canvas.create_rectangle(*self.scrollbar_thumb, width=1, outline="#bbb", fill="#ccc")
+        if thumb is None:
+            thumb = self.canvas.create_rectangle(*self.scrollbar_thumb, width=1, outline="#bbb", fill="#ccc", tags="scrollbar")
+            self._scrollbar_items = (track, thumb)
+        else:
+            self.canvas.coords(thumb, *self.scrollbar_thumb)
+
+
+# Let layout report widget hit boxes without importing this module
+_layout_module._register_widget_box = Browser._register_widget_box
 
 
 def main() -> None:
@@ -175,6 +175,7 @@ def style(node: Any, rules: List[Tuple[Any, Dict[str, str]]]) -> None:
     """Recursively apply styles to the DOM tree based on CSS rules."""
     # Start with inherited properties
     node.style = {}
+    node._px_cache = {}
     for prop, default_value in INHERITED_PROPERTIES.items():
         if getattr(node, 'parent', None):
             node.style[prop] = getattr(node.parent, 'style', {}).get(prop, default_value)
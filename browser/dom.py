@@ -8,6 +8,7 @@ traversing and inspecting the tree.
 
 from __future__ import annotations
 
+import sys
 from typing import List, Dict, Tuple, Optional, Any
 
 
@@ -19,6 +20,8 @@ class Text:
         self.parent: Optional[Element] = parent
         # Style dictionary populated during styling
         self.style: Dict[str, str] = {}
+        # Parsed pixel values of ``style`` entries; reset by css.style()
+        self._px_cache: Dict[str, float] = {}
         # Whether this node currently has focus (used for inputs)
         self.is_focused: bool = False
 
@@ -34,7 +37,14 @@ class Element:
         self.children: List[Any] = []
         self.parent: Optional[Element] = parent
         self.style: Dict[str, str] = {}
+        self._px_cache: Dict[str, float] = {}
         self.is_focused: bool = False
+        # The last innerHTML string assigned to this element; cleared by
+        # mark_mutated() when anything below it changes
+        self._innerHTML_source: Optional[str] = None
+        # BlockLayout.layout_mode() result; depends on the direct children
+        # and is cleared by mark_mutated()
+        self._layout_mode: Optional[str] = None
 
     def __repr__(self) -> str:
         return "<" + self.tag + ">"
@@ -47,6 +57,20 @@ def print_tree(node: Any, indent: int = 0) -> None:
         print_tree(c, indent + 1)
 
 
+def mark_mutated(node: Any) -> None:
+    """Invalidate cached content state after ``node``'s subtree changed.
+
+    Call this after changing the children of ``node`` or the attributes
+    of ``node`` or any of its descendants. Caches on ``node`` and all of
+    its ancestors are cleared.
+    """
+    while node is not None:
+        if isinstance(node, Element):
+            node._innerHTML_source = None
+            node._layout_mode = None
+        node = node.parent
+
+
 def tree_to_list(tree: Any, out: List[Any]) -> List[Any]:
     """Flatten the DOM tree into a list using preorder traversal."""
     out.append(tree)
@@ -81,8 +105,28 @@ class HTMLParser:
         # Stack of open elements
         self.unfinished: List[Any] = []
 
+    def reset(self, body: str) -> None:
+        """Reuse this parser for a new input string."""
+        self.body = body
+        self.unfinished.clear()
+
     def parse(self) -> Any:
         """Parse the HTML and return the root node."""
+        self._consume()
+        return self.finish()
+
+    def parse_fragment(self) -> Element:
+        """Parse the input as the contents of a ``<body>`` element.
+
+        Used for ``innerHTML`` assignments: the parse starts inside a
+        detached ``<body>`` so no implicit ``<html>`` is created, and
+        the returned element's children are the parsed fragment.
+        """
+        self.unfinished.append(Element("body", {}, None))
+        self._consume()
+        return self.finish()
+
+    def _consume(self) -> None:
         text = ""
         in_tag = False
         for c in self.body:
@@ -99,7 +143,6 @@ class HTMLParser:
                 text += c
         if not in_tag and text:
             self.add_text(text)
-        return self.finish()
 
     def get_attributes(self, text: str) -> Tuple[str, Dict[str, str]]:
         parts = text.split()
@@ -112,9 +155,9 @@ class HTMLParser:
                 key, value = attrpair.split("=", 1)
                 if len(value) > 2 and value[0] in ["'", '"']:
                     value = value[1:-1]
-                attributes[key.casefold()] = value
+                attributes[sys.intern(key.casefold())] = value
             else:
-                attributes[attrpair.casefold()] = ""
+                attributes[sys.intern(attrpair.casefold())] = ""
         return tag, attributes
 
     def implicit_tags(self, tag: Optional[str]) -> None:
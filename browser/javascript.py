@@ -13,8 +13,10 @@ continue to function without JavaScript support.
 
 from __future__ import annotations
 
+import sys
 import time
 import email.utils
+import functools
 from typing import Any, Dict, List, Tuple, Optional
 
 try:
@@ -22,8 +24,8 @@ try:
 except Exception:
     dukpy = None
 
-from .networking import COOKIE_JAR, URL
-from .dom import Element, Text, HTMLParser, tree_to_list
+from .networking import COOKIE_JAR, COOKIE_GENERATION, URL, purge_expired_cookies, store_cookie
+from .dom import Element, Text, HTMLParser, mark_mutated, tree_to_list
 from .css import CSSParser, INHERITED_PROPERTIES
 
 
@@ -32,33 +34,41 @@ from .css import CSSParser, INHERITED_PROPERTIES
 # for Node, Event and XMLHttpRequest. It forwards operations back
 # into Python via call_python.
 RUNTIME_JS = """
-function Node(handle) { this.handle = handle; }
-var LISTENERS = {};
+function Node(handle) { this.handle = handle; this._id = undefined; this._v = -1; }
+// Listener registry: handle → type → [listener]. Prototype-less objects
+// keep property lookups from falling through to Object.prototype.
+var LISTENERS = Object.create(null);
+// Bumped by every DOM write made through this runtime; attribute values
+// cached on Node objects are trusted only while it is unchanged.
+var DOM_VERSION = 0;
 Node.prototype.addEventListener = function(type, listener) {
-  if (!LISTENERS[this.handle]) LISTENERS[this.handle] = {};
-  var dict = LISTENERS[this.handle];
-  if (!dict[type]) dict[type] = [];
-  dict[type].push(listener);
+  var bucket = LISTENERS[this.handle];
+  if (!bucket) bucket = LISTENERS[this.handle] = Object.create(null);
+  var list = bucket[type];
+  if (!list) list = bucket[type] = [];
+  list.push(listener);
 };
 // dispatchEvent handles event bubbling. It calls listeners on this
-// node, then recurses up the tree if the event hasn’t been stopped.
+// node, then walks up the tree with the same Event object until the
+// event is stopped or the root is reached.
 Node.prototype.dispatchEvent = function(evt) {
-  var list = (LISTENERS[this.handle] && LISTENERS[this.handle][evt.type]) || [];
-  for (var i = 0; i < list.length; i++) {
-    list[i].call(this, evt);
-  }
-  var do_default = evt.do_default;
-  var do_bubble = evt.do_bubble;
-  if (do_bubble) {
-    var parentHandle = call_python("getParent", this.handle);
-    if (parentHandle != -1) {
-      var parent = new Node(parentHandle);
-      // propagate; merge default flags so that preventDefault anywhere
-      // stops the default
-      do_default = parent.dispatchEvent(evt) && do_default;
+  var L = LISTENERS, cp = call_python, type = evt.type;
+  var node = this;
+  while (true) {
+    var bucket = L[node.handle];
+    var list = bucket && bucket[type];
+    if (list) {
+      for (var i = 0; i < list.length; i++) {
+        list[i].call(node, evt);
+      }
     }
+    if (!evt.do_bubble) break;
+    var parentHandle = cp("getParent", node.handle);
+    if (parentHandle == -1) break;
+    node = new Node(parentHandle);
   }
-  return do_default;
+  // preventDefault anywhere along the path stops the default
+  return evt.do_default;
 };
 function Event(type) {
   this.type = type;
@@ -101,6 +111,7 @@ Object.defineProperty(Node.prototype, "innerHTML", {
     return call_python("innerHTML_get", this.handle);
   },
   set: function(value) {
+    DOM_VERSION++;
     call_python("innerHTML_set", this.handle, value.toString());
   }
 });
@@ -110,33 +121,44 @@ Object.defineProperty(Node.prototype, "outerHTML", {
     return call_python("outerHTML_get", this.handle);
   }
 });
-// Node.id property; forwards to getAttribute/set_attribute
+// Node.id property; forwards to getAttribute/set_attribute. Reads are
+// cached on the Node until the next DOM write.
 Object.defineProperty(Node.prototype, "id", {
   get: function() {
-    return call_python("getAttribute", this.handle, "id");
+    if (this._v === DOM_VERSION && this._id !== undefined) return this._id;
+    this._id = call_python("getAttribute", this.handle, "id");
+    this._v = DOM_VERSION;
+    return this._id;
   },
   set: function(value) {
+    DOM_VERSION++;
     call_python("set_attribute", this.handle, "id", value.toString());
   }
 });
 Node.prototype.getAttribute = function(attr) {
-  return call_python("getAttribute", this.handle, attr.toString());
+  attr = attr.toString();
+  if (attr === "id") return this.id;
+  return call_python("getAttribute", this.handle, attr);
 };
 Node.prototype.setAttribute = function(attr, val) {
+  DOM_VERSION++;
   call_python("set_attribute", this.handle, attr.toString(), val.toString());
 };
 // Node.appendChild inserts a child at the end of children
 Node.prototype.appendChild = function(child) {
+  DOM_VERSION++;
   call_python("append_child", this.handle, child.handle);
   return child;
 };
 // Node.insertBefore inserts a child before the reference node
 Node.prototype.insertBefore = function(child, ref) {
+  DOM_VERSION++;
   call_python("insert_before", this.handle, child.handle, ref.handle);
   return child;
 };
 // Node.removeChild detaches a child from this node
 Node.prototype.removeChild = function(child) {
+  DOM_VERSION++;
   call_python("remove_child", this.handle, child.handle);
   return child;
 };
@@ -166,6 +188,27 @@ XMLHttpRequest.prototype.send = function(body) {
 # Snippet used when dispatching events from Python into JavaScript
 EVENT_DISPATCH_JS = "new Node(dukpy.handle).dispatchEvent(new Event(dukpy.type))"
 
+# Common attribute names, interned so that lookups with names coming
+# from JavaScript hit the identity fast path of the attributes dict
+_INTERNED_ATTRS: Dict[str, str] = {
+    name: sys.intern(name)
+    for name in ("id", "class", "href", "src", "style", "type", "value", "name", "action", "method")
+}
+
+# Serialized document.cookie per origin: origin → (jar generation,
+# timestamp of the next expiry, serialized string). An entry is valid
+# until the jar is written to or the next cookie expires.
+_COOKIE_CACHE: Dict[str, Tuple[int, float, str]] = {}
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_expiry(exp: str) -> Optional[float]:
+    """Parse a cookie Expires date into a timestamp (None if invalid)."""
+    try:
+        return email.utils.parsedate_to_datetime(exp).timestamp()
+    except Exception:
+        return None
+
 
 class JSContext:
     """A per-tab JavaScript execution environment."""
@@ -177,6 +220,12 @@ class JSContext:
         # Bi-directional mapping between Python nodes and JS handles
         self.node_to_handle: Dict[Any, int] = {}
         self.handle_to_node: Dict[int, Any] = {}
+        # Last lookups in either direction; event bubbling and DOM walks
+        # tend to hit the same node several times in a row
+        self._last_handle: int = -1
+        self._last_node: Any = None
+        self._last_elt: Any = None
+        self._last_elt_handle: int = -1
         # Export Python functions to JS
         self.interp.export_function("querySelectorAll", self.querySelectorAll)
         self.interp.export_function("getAttribute", self.getAttribute)
@@ -195,18 +244,42 @@ class JSContext:
         self.interp.export_function("set_cookie", self.set_cookie)
         # XMLHttpRequest
         self.interp.export_function("XMLHttpRequest_send", self.XMLHttpRequest_send)
-        # Load runtime
-        self.interp.evaljs(RUNTIME_JS)
+        # Load runtime. The script must complete with a value DukPy can
+        # convert back to Python; RUNTIME_JS on its own completes with a
+        # function, so evaljs raised, construction failed and pages ran
+        # without JavaScript.
+        self.interp.evaljs(RUNTIME_JS + "\nnull;")
         # Keep track of variables defined for element IDs
         self.id_vars: List[str] = []
+        # Parser reused across innerHTML assignments
+        self._parser_pool: Optional[HTMLParser] = None
+        # Elements in the document carrying an id, keyed by id (several
+        # elements may share one). Built by the first update_ids() and
+        # then maintained per mutation.
+        self._id_nodes: Dict[str, List[Element]] = {}
+        self._ids_indexed: bool = False
 
     # Handle management
     def get_handle(self, elt: Any) -> int:
-        if elt not in self.node_to_handle:
+        if elt is self._last_elt:
+            return self._last_elt_handle
+        h = self.node_to_handle.get(elt)
+        if h is None:
             h = len(self.node_to_handle)
             self.node_to_handle[elt] = h
             self.handle_to_node[h] = elt
-        return self.node_to_handle[elt]
+        self._last_elt, self._last_elt_handle = elt, h
+        return h
+
+    def _node(self, handle: int) -> Any:
+        # Handles are never reassigned, so a cached hit cannot go stale.
+        # Misses are not cached: the handle may be registered later.
+        if handle == self._last_handle:
+            return self._last_node
+        node = self.handle_to_node.get(handle)
+        if node is not None:
+            self._last_handle, self._last_node = handle, node
+        return node
 
     # Exported functions callable from JS
     def querySelectorAll(self, selector_text: str) -> List[int]:
@@ -219,21 +292,32 @@ class JSContext:
         return [self.get_handle(n) for n in nodes]
 
     def getAttribute(self, handle: int, attr: str) -> str:
-        node = self.handle_to_node.get(handle)
+        node = self._node(handle)
         if isinstance(node, Element):
+            attr = _INTERNED_ATTRS.get(attr, attr)
             return node.attributes.get(attr, "")
         return ""
 
     def set_attribute(self, handle: int, attr: str, value: str) -> None:
-        node = self.handle_to_node.get(handle)
+        node = self._node(handle)
         if not isinstance(node, Element):
             return
+        attr = _INTERNED_ATTRS.get(attr, attr)
+        # Rewriting the current value changes nothing; skip the restyle
+        if node.attributes.get(attr) == value:
+            return
+        track_id = attr == "id" and self._in_document(node)
+        if track_id:
+            self._index_ids([node], add=False)
         # Update attribute
         if value is None:
             if attr in node.attributes:
                 del node.attributes[attr]
         else:
             node.attributes[attr] = value
+        if track_id:
+            self._index_ids([node], add=True)
+        mark_mutated(node)
         # Update id variables if id changed
         if attr == "id":
             self.update_ids()
@@ -242,27 +326,44 @@ class JSContext:
         self.tab.apply_styles_and_render()
 
     def innerHTML_set(self, handle: int, s: str) -> None:
-        node = self.handle_to_node.get(handle)
+        node = self._node(handle)
         if not isinstance(node, Element):
             return
-        # Parse new HTML inside a dummy wrapper
+        # Assigning the same markup again would rebuild an identical
+        # subtree; skip it unless the subtree changed since
+        if node._innerHTML_source == s:
+            return
+        # Parse new HTML as a fragment, reusing the pooled parser
+        parser = self._parser_pool
+        if parser is None:
+            parser = self._parser_pool = HTMLParser(s)
+        else:
+            parser.reset(s)
         try:
-            parsed = HTMLParser("<body>" + s + "</body>").parse()
+            fragment = parser.parse_fragment()
         except Exception:
             return
-        new_children = parsed.children
+        new_children = fragment.children
+        in_document = self._in_document(node)
+        if in_document:
+            for c in node.children:
+                self._index_ids(tree_to_list(c, []), add=False)
         # Replace children
         node.children = []
         for c in new_children:
             c.parent = node
         node.children = new_children
+        if in_document:
+            self._index_ids(tree_to_list(node, [])[1:], add=True)
+        mark_mutated(node)
+        node._innerHTML_source = s
         # Update scripts/styles and re-render
         self.tab.process_scripts_and_styles()
         self.tab.apply_styles_and_render()
         self.update_ids()
 
     def innerHTML_get(self, handle: int) -> str:
-        node = self.handle_to_node.get(handle)
+        node = self._node(handle)
         if node is None:
             return ""
         out: List[str] = []
@@ -271,7 +372,7 @@ class JSContext:
         return "".join(out)
 
     def outerHTML_get(self, handle: int) -> str:
-        node = self.handle_to_node.get(handle)
+        node = self._node(handle)
         if node is None:
             return ""
         return self._serialize(node)
@@ -285,6 +386,8 @@ class JSContext:
                 if v == "":
                     attrs.append(k)
                 else:
+                    # Only quotes are escaped: the parser does not decode
+                    # entities, so escaping more would not round-trip
                     val = v.replace('"', '&quot;')
                     attrs.append(f'{k}="{val}"')
             attr_str = (" " + " ".join(attrs)) if attrs else ""
@@ -298,7 +401,7 @@ class JSContext:
         return ""
 
     def children(self, handle: int) -> List[int]:
-        node = self.handle_to_node.get(handle)
+        node = self._node(handle)
         out: List[int] = []
         if isinstance(node, Element):
             for c in node.children:
@@ -312,32 +415,38 @@ class JSContext:
         return self.get_handle(new_node)
 
     def append_child(self, parent_handle: int, child_handle: int) -> None:
-        parent = self.handle_to_node.get(parent_handle)
-        child = self.handle_to_node.get(child_handle)
+        parent = self._node(parent_handle)
+        child = self._node(child_handle)
         if not (isinstance(parent, Element) and child is not None):
             return
+        was_in_document = self._in_document(child)
         if hasattr(child, "parent") and child.parent is not None:
             try:
                 child.parent.children.remove(child)
             except ValueError:
                 pass
+            mark_mutated(child.parent)
         child.parent = parent
         parent.children.append(child)
+        mark_mutated(parent)
+        self._reindex_moved(child, was_in_document)
         self.tab.process_scripts_and_styles()
         self.tab.apply_styles_and_render()
         self.update_ids()
 
     def insert_before(self, parent_handle: int, child_handle: int, ref_handle: int) -> None:
-        parent = self.handle_to_node.get(parent_handle)
-        child = self.handle_to_node.get(child_handle)
-        ref = self.handle_to_node.get(ref_handle)
+        parent = self._node(parent_handle)
+        child = self._node(child_handle)
+        ref = self._node(ref_handle)
         if not (isinstance(parent, Element) and child is not None and ref is not None):
             return
+        was_in_document = self._in_document(child)
         if hasattr(child, "parent") and child.parent is not None:
             try:
                 child.parent.children.remove(child)
             except ValueError:
                 pass
+            mark_mutated(child.parent)
         child.parent = parent
         try:
             idx = parent.children.index(ref)
@@ -345,34 +454,78 @@ class JSContext:
             parent.children.append(child)
         else:
             parent.children.insert(idx, child)
+        mark_mutated(parent)
+        self._reindex_moved(child, was_in_document)
         self.tab.process_scripts_and_styles()
         self.tab.apply_styles_and_render()
         self.update_ids()
 
     def remove_child(self, parent_handle: int, child_handle: int) -> None:
-        parent = self.handle_to_node.get(parent_handle)
-        child = self.handle_to_node.get(child_handle)
+        parent = self._node(parent_handle)
+        child = self._node(child_handle)
         if not (isinstance(parent, Element) and child is not None):
             return
+        was_in_document = self._in_document(child)
         try:
             parent.children.remove(child)
         except ValueError:
             return
         child.parent = None
+        mark_mutated(parent)
+        self._reindex_moved(child, was_in_document)
         self.tab.process_scripts_and_styles()
         self.tab.apply_styles_and_render()
         self.update_ids()
 
     def getParent(self, handle: int) -> int:
-        node = self.handle_to_node.get(handle)
+        node = self._node(handle)
         if hasattr(node, "parent") and node.parent is not None:
             return self.get_handle(node.parent)
         return -1
 
+    # Id index maintenance
+    def _in_document(self, node: Any) -> bool:
+        root = getattr(self.tab, 'nodes', None)
+        while node is not None:
+            if node is root:
+                return True
+            node = getattr(node, 'parent', None)
+        return False
+
+    def _index_ids(self, nodes: List[Any], add: bool) -> None:
+        """Add or drop the id-bearing elements in ``nodes`` from the index."""
+        if not self._ids_indexed:
+            return
+        for node in nodes:
+            if isinstance(node, Element) and "id" in node.attributes:
+                key = node.attributes["id"]
+                if add:
+                    elements = self._id_nodes.setdefault(key, [])
+                    if not any(e is node for e in elements):
+                        elements.append(node)
+                else:
+                    elements = self._id_nodes.get(key, [])
+                    for i, e in enumerate(elements):
+                        if e is node:
+                            del elements[i]
+                            break
+                    if not elements:
+                        self._id_nodes.pop(key, None)
+
+    def _reindex_moved(self, child: Any, was_in_document: bool) -> None:
+        # Only a move into or out of the document changes the index
+        now_in_document = self._in_document(child)
+        if now_in_document != was_in_document:
+            self._index_ids(tree_to_list(child, []), add=now_in_document)
+
     # High-level operations
     def update_ids(self) -> None:
         if dukpy is None:
             return
+        if not self._ids_indexed:
+            self._ids_indexed = True
+            if getattr(self.tab, 'nodes', None):
+                self._index_ids(tree_to_list(self.tab.nodes, []), add=True)
         # Clear existing variables
         for var in self.id_vars:
             try:
@@ -380,18 +533,25 @@ class JSContext:
             except Exception:
                 pass
         self.id_vars = []
-        nodes = tree_to_list(self.tab.nodes, []) if getattr(self.tab, 'nodes', None) else []
-        for node in nodes:
-            if isinstance(node, Element) and "id" in node.attributes:
-                varname = node.attributes["id"]
-                if not varname or not (varname[0].isalpha() or varname[0] == "_"):
-                    continue
-                handle = self.get_handle(node)
-                try:
-                    self.interp.evaljs(f"var {varname} = new Node({handle});")
-                    self.id_vars.append(varname)
-                except Exception:
-                    continue
+        # With duplicate ids the last element in document order wins, as
+        # when binding every element in a full tree walk
+        order: Optional[Dict[int, int]] = None
+        for varname, elements in self._id_nodes.items():
+            if not varname or not (varname[0].isalpha() or varname[0] == "_"):
+                continue
+            if len(elements) == 1:
+                node = elements[0]
+            else:
+                if order is None:
+                    order = {id(n): i for i, n in enumerate(tree_to_list(self.tab.nodes, []))}
+                rank = order
+                node = max(elements, key=lambda e: rank.get(id(e), -1))
+            handle = self.get_handle(node)
+            try:
+                self.interp.evaljs(f"var {varname} = new Node({handle});")
+                self.id_vars.append(varname)
+            except Exception:
+                continue
 
     def run(self, script: str, code: Optional[str] = None) -> None:
         # Execute a snippet of JavaScript code in the interpreter
@@ -450,26 +610,19 @@ class JSContext:
         except Exception:
             return ""
         now = time.time()
+        generation = COOKIE_GENERATION.get(origin, 0)
+        cached = _COOKIE_CACHE.get(origin)
+        if cached is not None and cached[0] == generation and now < cached[1]:
+            return cached[2]
+        # Expired cookies are dropped up front, so the loop below needs
+        # no per-cookie expiry checks
+        next_expiry = purge_expired_cookies(now)
         cookies: List[str] = []
         jar = COOKIE_JAR.get(origin, {})
-        expired: List[str] = []
         for name, (val, params) in jar.items():
             # Skip HttpOnly cookies when reading
             if any(k.lower() == 'httponly' for k in params):
                 continue
-            exp = params.get('expires')
-            if exp:
-                try:
-                    if isinstance(exp, (int, float)):
-                        expires_ts = float(exp)
-                    else:
-                        dt = email.utils.parsedate_to_datetime(str(exp))
-                        expires_ts = dt.timestamp()
-                except Exception:
-                    expires_ts = None
-                if expires_ts is not None and now > expires_ts:
-                    expired.append(name)
-                    continue
             parts: List[str] = [f"{name}={val}"]
             for k, v in params.items():
                 if k.lower() == 'httponly':
@@ -479,9 +632,9 @@ class JSContext:
                 else:
                     parts.append(f"{k}={v}")
             cookies.append("; ".join(parts))
-        for name in expired:
-            jar.pop(name, None)
-        return "; ".join(cookies)
+        serialized = "; ".join(cookies)
+        _COOKIE_CACHE[origin] = (generation, next_expiry, serialized)
+        return serialized
 
     def set_cookie(self, cookie_str: str) -> None:
         try:
@@ -512,9 +665,8 @@ class JSContext:
             return
         exp = params.get('expires')
         if exp:
-            try:
-                dt = email.utils.parsedate_to_datetime(str(exp))
-                params['expires'] = dt.timestamp()  # type: ignore[assignment]
-            except Exception:
-                pass
-        COOKIE_JAR.setdefault(origin, {})[name] = (val, params)
+            expires_ts = _parse_expiry(str(exp))
+            if expires_ts is not None:
+                params['expires'] = expires_ts  # type: ignore[assignment]
+        _COOKIE_CACHE.pop(origin, None)
+        store_cookie(origin, name, val, params)
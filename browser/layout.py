@@ -7,17 +7,17 @@ defines simple geometry and drawing helper classes (``Rect``,
 tree and collect paint instructions.
 
 Portions of the implementation are adapted from the original
-monolithic browser, but reorganized into a separate module. Some
-functions refer to the :class:`Browser` class at runtime; the browser
-module will inject the Browser class into this module so that hit
-testing works without a circular import.
+monolithic browser, but reorganized into a separate module. Widget
+hit boxes are reported through the ``_register_widget_box`` callback,
+which the browser module installs at import time so that hit testing
+works without a circular import.
 """
 
 from __future__ import annotations
 
 import tkinter
 import tkinter.font
-from typing import Any, List, Tuple, Optional, Dict
+from typing import Any, Callable, List, Tuple, Optional, Dict, FrozenSet, Sequence
 
 # Import DOM types and inherited CSS properties
 from .dom import Text, Element
@@ -39,6 +39,79 @@ def get_font(size: int, weight: str, style: str) -> tkinter.font.Font:
     return FONTS[key]
 
 
+# Metrics cache: keyed by Tk font name → font.metrics() dict. Fonts are
+# never reconfigured, so their metrics never change once measured.
+FONT_METRICS: Dict[str, Dict[str, int]] = {}
+
+
+def font_metrics(font: tkinter.font.Font) -> Dict[str, int]:
+    """Return the cached ascent/descent/linespace metrics for ``font``."""
+    metrics = FONT_METRICS.get(font.name)
+    if metrics is None:
+        metrics = FONT_METRICS[font.name] = font.metrics()
+    return metrics
+
+
+# Width cache: keyed by (Tk font name, text) → pixel width. Body text
+# repeats the same words constantly, and every relayout re-measures them.
+_MEASURE_CACHE: Dict[Tuple[str, str], int] = {}
+_MEASURE_CACHE_LIMIT = 50000
+
+
+def measure(font: tkinter.font.Font, text: str) -> int:
+    """Return the cached pixel width of ``text`` in ``font``."""
+    key = (font.name, text)
+    width = _MEASURE_CACHE.get(key)
+    if width is None:
+        if len(_MEASURE_CACHE) >= _MEASURE_CACHE_LIMIT:
+            _MEASURE_CACHE.clear()
+        width = _MEASURE_CACHE[key] = font.measure(text)
+    return width
+
+
+# Width of a single space per Tk font name; needed after every word
+_SPACE_WIDTHS: Dict[str, int] = {}
+
+
+def space_width(font: tkinter.font.Font) -> int:
+    """Return the cached width of ``" "`` in ``font``."""
+    width = _SPACE_WIDTHS.get(font.name)
+    if width is None:
+        width = _SPACE_WIDTHS[font.name] = font.measure(" ")
+    return width
+
+
+# Default font size in CSS pixels and the Tk point size derived from it
+_DEFAULT_FONT_PX = float(INHERITED_PROPERTIES["font-size"][:-2])
+_DEFAULT_FONT_SIZE = int(_DEFAULT_FONT_PX * 0.75)
+
+
+def _px(node: Any, key: str, default: float) -> float:
+    """Return ``node.style[key]`` parsed as pixels, cached on the node.
+
+    Falls back to ``default`` when the property is missing or is not a
+    valid ``px`` length.
+    """
+    cache = node._px_cache
+    value = cache.get(key)
+    if value is None:
+        raw = node.style.get(key)
+        if raw is None:
+            value = default
+        else:
+            try:
+                value = float(raw[:-2])
+            except Exception:
+                value = default
+        cache[key] = value
+    return value
+
+
+# Hit-box registration callback: (element, (x1, y1, x2, y2)) → None.
+# Installed by the browser module; boxes are dropped while it is unset.
+_register_widget_box: Optional[Callable[[Any, Tuple[float, float, float, float]], None]] = None
+
+
 # Layout constants
 WIDTH, HEIGHT = 800, 600
 HSTEP, VSTEP = 13, 18
@@ -48,14 +121,14 @@ INPUT_WIDTH_PX = 200
 CHECKBOX_SIZE = 16
 
 # Block-level elements as per simplified HTML specification
-BLOCK_ELEMENTS: List[str] = [
+BLOCK_ELEMENTS: FrozenSet[str] = frozenset([
     "html", "body", "article", "section", "nav", "aside",
     "h1", "h2", "h3", "h4", "h5", "h6", "hgroup", "header",
     "footer", "address", "p", "hr", "pre", "blockquote",
     "ol", "ul", "menu", "li", "dl", "dt", "dd", "figure",
     "figcaption", "main", "div", "table", "form", "fieldset",
     "legend", "details", "summary"
-]
+])
 
 
 class DocumentLayout:
@@ -76,8 +149,8 @@ class DocumentLayout:
         child.layout()
         self.height = child.height
 
-    def paint(self) -> List[Any]:
-        return []
+    def paint(self) -> Sequence[Any]:
+        return ()
 
     def should_paint(self) -> bool:
         return True
@@ -90,7 +163,7 @@ class BlockLayout:
     node's structure and children, it either creates child block
     layouts (for elements with block descendants) or an inline display
     list representing runs of text and widgets. It also registers
-    clickable widget boxes via :class:`Browser` for hit-testing.
+    clickable widget boxes via ``_register_widget_box`` for hit-testing.
     """
     def __init__(self, node: Any, parent: Any, previous: Optional['BlockLayout']) -> None:
         self.node = node
@@ -109,7 +182,17 @@ class BlockLayout:
     def layout_mode(self) -> str:
         if isinstance(self.node, Text):
             return "inline"
-        elif any(isinstance(c, Element) and c.tag in BLOCK_ELEMENTS for c in getattr(self.node, 'children', [])):
+        # The mode only depends on the node's own children, so it is cached
+        # on the element until mark_mutated() clears it
+        mode = getattr(self.node, '_layout_mode', None)
+        if mode is None:
+            mode = self._compute_layout_mode()
+            if isinstance(self.node, Element):
+                self.node._layout_mode = mode
+        return mode
+
+    def _compute_layout_mode(self) -> str:
+        if any(isinstance(c, Element) and c.tag in BLOCK_ELEMENTS for c in getattr(self.node, 'children', [])):
             return "block"
         elif getattr(self.node, 'children', []) or (isinstance(self.node, Element) and self.node.tag in ["input", "button"]):
             return "inline"
@@ -160,13 +243,18 @@ class BlockLayout:
                     last_y = it[1]
                     break
             # Default font for computing line spacing
-            default_font = get_font(12, "normal", "roman")
-            self.height = max((last_y - self.y) + default_font.metrics("linespace"), VSTEP)
+            default_font = get_font(_DEFAULT_FONT_SIZE, "normal", "roman")
+            self.height = max((last_y - self.y) + font_metrics(default_font)["linespace"], VSTEP)
 
     def recurse(self, node: Any) -> None:
         if isinstance(node, Text):
+            # Every word of a text run shares the same style, so resolve the
+            # font, color and space advance once for the whole run
+            font = self.font_for(node)
+            color = node.style.get("color", "black")
+            space = space_width(font)
             for w in node.text.split():
-                self.word(node, w)
+                self.word(node, w, font, color, space)
         else:
             if isinstance(node, Element) and node.tag in ["input", "button", "br"]:
                 if node.tag == "br":
@@ -177,28 +265,24 @@ class BlockLayout:
                 for c in getattr(node, 'children', []):
                     self.recurse(c)
 
-    def word(self, node: Any, word: str) -> None:
-        # Determine font from CSS styles
+    def font_for(self, node: Any) -> tkinter.font.Font:
+        """Return the font described by ``node``'s CSS styles."""
         weight = node.style.get("font-weight", "normal")
         style = node.style.get("font-style", "normal")
         if style == "normal":
             style = "roman"
-        size_value = node.style.get("font-size", INHERITED_PROPERTIES["font-size"])
-        try:
-            px = float(size_value[:-2])
-        except Exception:
-            px = float(INHERITED_PROPERTIES["font-size"][:-2])
-        size = int(px * 0.75)
-        font = get_font(size, weight, style)
-        color = node.style.get("color", "black")
-        w = font.measure(word)
+        size = int(_px(node, "font-size", _DEFAULT_FONT_PX) * 0.75)
+        return get_font(size, weight, style)
+
+    def word(self, node: Any, word: str, font: tkinter.font.Font, color: str, space: int) -> None:
+        w = measure(font, word)
         # New line if word would overflow
         if self.cursor_x + w > self.width and self.line:
             self.flush()
         # Append item to line buffer
         self.line.append(("text", self.cursor_x, word, font, color, node))
         # Advance cursor
-        self.cursor_x += w + font.measure(" ")
+        self.cursor_x += w + space
 
     def input(self, node: Any) -> None:
         # Determine input type; default to text
@@ -206,16 +290,7 @@ class BlockLayout:
         # Hidden inputs take no space
         if itype == "hidden":
             return
-        # Determine font
-        weight = node.style.get("font-weight", "normal")
-        style = node.style.get("font-style", "normal")
-        if style == "normal":
-            style = "roman"
-        try:
-            size = int(float(node.style.get("font-size", INHERITED_PROPERTIES["font-size"])[:-2]) * 0.75)
-        except Exception:
-            size = int(float(INHERITED_PROPERTIES["font-size"][:-2]) * 0.75)
-        font = get_font(size, weight, style)
+        font = self.font_for(node)
         is_checkbox = itype == "checkbox"
         # Compute width of the input or button
         if is_checkbox:
@@ -225,24 +300,20 @@ class BlockLayout:
         else:
             # Button: width based on its label text
             text = self.button_label(node)
-            w = max(80, font.measure(text) + 20)
+            w = max(80, measure(font, text) + 20)
         # Wrap if necessary
         if self.cursor_x + w > self.width:
             self.flush()
-        metrics = font.metrics()
+        metrics = font_metrics(font)
         max_ascent = metrics["ascent"]
         baseline = self.cursor_y + max_ascent
         x = self.x + self.cursor_x
-        y_top = self.y + baseline - font.metrics("ascent")
-        y_bottom = y_top + (CHECKBOX_SIZE if is_checkbox else font.metrics("linespace"))
+        y_top = self.y + baseline - metrics["ascent"]
+        y_bottom = y_top + (CHECKBOX_SIZE if is_checkbox else metrics["linespace"])
         rect = (x, y_top, x + w, y_bottom)
         # Register widget box for hit testing
-        # The Browser class will be injected into this module by project.browser
-        try:
-            # type: ignore[name-defined]
-            Browser._register_widget_box(node, rect)  # noqa: F821
-        except Exception:
-            pass
+        if _register_widget_box is not None:
+            _register_widget_box(node, rect)
         # Draw background or checkbox outline
         if is_checkbox:
             # Checkbox background and border
@@ -269,10 +340,10 @@ class BlockLayout:
             color = node.style.get("color", "black")
             self.display_list.append(("text_abs", (x, y_top), text, font, color))
             if getattr(node, 'is_focused', False) and isinstance(node, Element) and node.tag == "input":
-                cx = x + font.measure(text)
+                cx = x + measure(font, text)
                 self.display_list.append(("line", (cx, y_top, cx, y_bottom, "black", 1)))
         # Advance cursor
-        self.cursor_x += w + font.measure(" ")
+        self.cursor_x += w + space_width(font)
 
     def button_label(self, node: Any) -> str:
         if isinstance(node, Element) and len(node.children) == 1 and isinstance(node.children[0], Text):
@@ -283,27 +354,37 @@ class BlockLayout:
         """Flush the current line buffer to the display list."""
         if not self.line:
             return
-        metrics_list = [itm[3].metrics() for itm in self.line]
+        metrics_list = [font_metrics(itm[3]) for itm in self.line]
         max_ascent = max(m["ascent"] for m in metrics_list)
         max_descent = max(m["descent"] for m in metrics_list)
         baseline = self.cursor_y + max_ascent
-        for kind, rel_x, word, font, color, node in self.line:
+        display_list = self.display_list
+        # Consecutive words in the same font and color that sit exactly one
+        # space apart are drawn as a single text item: [x, y, words, font,
+        # color, rel_x where the next word would have to start]
+        run: Optional[List[Any]] = None
+        for (kind, rel_x, word, font, color, node), metrics in zip(self.line, metrics_list):
             x = self.x + rel_x
-            y = self.y + baseline - font.metrics("ascent")
-            self.display_list.append(("text_abs", (x, y), word, font, color))
+            y = self.y + baseline - metrics["ascent"]
+            if run is not None and run[3] is font and run[4] == color and run[5] == rel_x:
+                run[2].append(word)
+            else:
+                if run is not None:
+                    display_list.append(("text_abs", (run[0], run[1]), " ".join(run[2]), run[3], run[4]))
+                run = [x, y, [word], font, color, 0]
+            run[5] = rel_x + measure(font, word) + space_width(font)
             # Register hyperlink hit boxes
             link = node
             while link and not (isinstance(link, Element) and link.tag == "a"):
                 link = getattr(link, 'parent', None)
             if link and isinstance(link, Element) and "href" in link.attributes:
-                width = font.measure(word)
-                height = font.metrics("linespace")
+                width = measure(font, word)
+                height = metrics["linespace"]
                 rect = (x, y, x + width, y + height)
-                try:
-                    # type: ignore[name-defined]
-                    Browser._register_widget_box(link, rect)  # noqa: F821
-                except Exception:
-                    pass
+                if _register_widget_box is not None:
+                    _register_widget_box(link, rect)
+        if run is not None:
+            display_list.append(("text_abs", (run[0], run[1]), " ".join(run[2]), run[3], run[4]))
         # Move to next line
         self.cursor_y = baseline + int(1.25 * max_descent)
         self.cursor_x = 0
@@ -327,24 +408,22 @@ class BlockLayout:
             return False
         return True
 
-    def paint(self) -> List[Any]:
+    def paint(self) -> Sequence[Any]:
+        is_pre = isinstance(self.node, Element) and self.node.tag == "pre"
+        # Most block boxes only contain other boxes; avoid allocating an
+        # empty command list for each of them
+        if not self.display_list and not is_pre:
+            return ()
         cmds: List[Any] = []
-        if isinstance(self.node, Element) and self.node.tag == "pre":
+        if is_pre:
             x2, y2 = self.x + self.width, self.y + self.height
             cmds.append(DrawRect(self.x, self.y, x2, y2, "gray"))
+        handlers = _PAINT_HANDLERS
+        append = cmds.append
         for item in self.display_list:
-            if item[0] == "text_abs":
-                _, (x, y), word, font, color = item
-                cmds.append(DrawText(x, y, word, font, color))
-            elif item[0] == "rect":
-                _, (x1, y1, x2, y2), color = item
-                cmds.append(DrawRect(x1, y1, x2, y2, color))
-            elif item[0] == "line":
-                _, (x1, y1, x2, y2, color, th) = item
-                cmds.append(DrawLine(x1, y1, x2, y2, color, th))
-            elif item[0] == "outline":
-                _, (x1, y1, x2, y2), color, th = item
-                cmds.append(DrawOutline(x1, y1, x2, y2, color, th))
+            handler = handlers.get(item[0])
+            if handler is not None:
+                append(handler(item))
         return cmds
 
 
@@ -360,11 +439,15 @@ class Rect:
         return self.left <= x <= self.right and self.top <= y <= self.bottom
 
 
+# Every drawing command exposes ``top``/``bottom`` page coordinates so
+# the browser can skip commands that are far outside the viewport.
+
 class DrawText:
     """Draw a string at a fixed position."""
     def __init__(self, x1: float, y1: float, text: str, font: tkinter.font.Font, color: str) -> None:
         self.left = x1
         self.top = y1
+        self.bottom = y1 + font_metrics(font)["linespace"]
         self.text = text
         self.font = font
         self.color = color
@@ -393,6 +476,8 @@ class DrawLine:
         self.y1 = y1
         self.x2 = x2
         self.y2 = y2
+        self.top = min(y1, y2)
+        self.bottom = max(y1, y2)
         self.color = color
         self.thickness = thickness
 
@@ -407,6 +492,8 @@ class DrawOutline:
         self.y1 = y1
         self.x2 = x2
         self.y2 = y2
+        self.top = min(y1, y2)
+        self.bottom = max(y1, y2)
         self.color = color
         self.thickness = thickness
 
@@ -414,11 +501,49 @@ class DrawOutline:
         canvas.create_rectangle(self.x1, self.y1 - scroll, self.x2, self.y2 - scroll, outline=self.color, width=self.thickness)
 
 
+# Converters from BlockLayout display-list items to drawing commands
+def _paint_text_abs(item: Tuple) -> DrawText:
+    _, (x, y), word, font, color = item
+    return DrawText(x, y, word, font, color)
+
+
+def _paint_rect(item: Tuple) -> DrawRect:
+    _, (x1, y1, x2, y2), color = item
+    return DrawRect(x1, y1, x2, y2, color)
+
+
+def _paint_line(item: Tuple) -> DrawLine:
+    _, (x1, y1, x2, y2, color, th) = item
+    return DrawLine(x1, y1, x2, y2, color, th)
+
+
+def _paint_outline(item: Tuple) -> DrawOutline:
+    _, (x1, y1, x2, y2), color, th = item
+    return DrawOutline(x1, y1, x2, y2, color, th)
+
+
+_PAINT_HANDLERS: Dict[str, Any] = {
+    "text_abs": _paint_text_abs,
+    "rect": _paint_rect,
+    "line": _paint_line,
+    "outline": _paint_outline,
+}
+
+
 def paint_tree(layout_object: Any, display_list: List[Any]) -> None:
-    """Walk the layout tree and collect drawing commands."""
-    if hasattr(layout_object, "should_paint") and not layout_object.should_paint():
-        pass
-    else:
-        display_list.extend(layout_object.paint())
-    for child in getattr(layout_object, 'children', []):
-        paint_tree(child, display_list)
+    """Walk the layout tree and collect drawing commands.
+
+    The walk is iterative (preorder, children in document order) and
+    appends straight into ``display_list``.
+    """
+    stack = [layout_object]
+    pop = stack.pop
+    push = stack.extend
+    extend = display_list.extend
+    while stack:
+        obj = pop()
+        if not hasattr(obj, "should_paint") or obj.should_paint():
+            extend(obj.paint())
+        children = getattr(obj, 'children', None)
+        if children:
+            push(reversed(children))
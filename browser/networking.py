@@ -12,14 +12,380 @@ browser, but isolates networking concerns in a standalone module.
 
 from __future__ import annotations
 
+import asyncio
+import heapq
+import operator
 import socket
 import ssl
+import threading
 import time
 import email.utils
-from typing import Dict, Tuple, Optional
+import functools
+from typing import Any, Dict, List, Tuple, Optional, Union
 
 # Cookie jar type: maps origin → cookie name → (value, params)
 COOKIE_JAR: Dict[str, Dict[str, Tuple[str, Dict[str, str]]]] = {}
+# Bumped whenever a cookie is stored for an origin so that derived
+# caches (e.g. the serialized ``document.cookie``) know to rebuild
+COOKIE_GENERATION: Dict[str, int] = {}
+# Min-heap of (expires timestamp, origin, cookie name) across all origins.
+# Entries for cookies that were later overwritten are skipped lazily;
+# _expiry_stale counts them so the heap can be rebuilt from the jar once
+# they make up most of it.
+_EXPIRY_HEAP: List[Tuple[float, str, str]] = []
+_expiry_stale = 0
+_EXPIRY_REBUILD_MIN = 64
+
+
+def _rebuild_expiry_heap() -> None:
+    """Rebuild the expiry heap from the cookies currently in the jar."""
+    global _expiry_stale
+    _EXPIRY_HEAP[:] = [
+        (float(params["expires"]), origin, name)
+        for origin, jar in COOKIE_JAR.items()
+        for name, (_, params) in jar.items()
+        if isinstance(params.get("expires"), (int, float))
+    ]
+    heapq.heapify(_EXPIRY_HEAP)
+    _expiry_stale = 0
+
+
+def store_cookie(origin: str, name: str, value: str, params: Dict[str, str]) -> None:
+    """Store a cookie in the jar for ``origin`` and bump its generation.
+
+    A numeric ``expires`` string is normalized to a float here, so that
+    expiry is only ever tracked through the expiry heap.
+    """
+    global _expiry_stale
+    expires = params.get("expires")
+    if isinstance(expires, str) and expires:
+        try:
+            params["expires"] = float(expires)  # type: ignore[assignment]
+        except ValueError:
+            pass
+    jar = COOKIE_JAR.setdefault(origin, {})
+    old = jar.get(name)
+    old_expires = old[1].get("expires") if old is not None else None
+    jar[name] = (value, params)
+    expires = params.get("expires")
+    # Overwriting with the same expiry keeps the existing heap entry valid
+    if old_expires != expires:
+        if isinstance(old_expires, (int, float)):
+            _expiry_stale += 1
+        if isinstance(expires, (int, float)):
+            heapq.heappush(_EXPIRY_HEAP, (float(expires), origin, name))
+        if _expiry_stale > _EXPIRY_REBUILD_MIN and 2 * _expiry_stale > len(_EXPIRY_HEAP):
+            _rebuild_expiry_heap()
+    COOKIE_GENERATION[origin] = COOKIE_GENERATION.get(origin, 0) + 1
+
+
+def purge_expired_cookies(now: float) -> float:
+    """Remove cookies of every origin that expired before ``now``.
+
+    Only cookies whose expiry has actually passed are touched, so the
+    cost is proportional to the number of expired cookies rather than
+    the size of the jar.
+
+    :returns: The timestamp of the next pending expiry, or ``inf``.
+    """
+    global _expiry_stale
+    heap = _EXPIRY_HEAP
+    while heap and heap[0][0] < now:
+        expires, origin, name = heapq.heappop(heap)
+        jar = COOKIE_JAR.get(origin)
+        entry = jar.get(name) if jar is not None else None
+        if entry is not None and entry[1].get("expires") == expires:
+            del jar[name]  # type: ignore[union-attr]
+        elif _expiry_stale:
+            _expiry_stale -= 1
+    return heap[0][0] if heap else float("inf")
+
+
+# Idle keep-alive connections per (scheme, host, port)
+_POOL: Dict[Tuple[str, str, int], List[socket.socket]] = {}
+_POOL_LOCK = threading.Lock()
+_POOL_MAX_PER_ORIGIN = 8
+
+
+def _pool_take(key: Tuple[str, str, int]) -> Optional[socket.socket]:
+    """Return an idle pooled connection for ``key``, if there is one."""
+    with _POOL_LOCK:
+        socks = _POOL.get(key)
+        return socks.pop() if socks else None
+
+
+def _pool_put(key: Tuple[str, str, int], sock: socket.socket) -> None:
+    """Return ``sock`` to the pool, or close it if the pool is full."""
+    with _POOL_LOCK:
+        socks = _POOL.setdefault(key, [])
+        if len(socks) < _POOL_MAX_PER_ORIGIN:
+            socks.append(sock)
+            return
+    sock.close()
+
+
+# Resolved addresses per (host, port): (time resolved, [(family, sockaddr)])
+_DNS_CACHE: Dict[Tuple[str, int], Tuple[float, List[Tuple[int, Tuple[Any, ...]]]]] = {}
+_DNS_TTL = 60.0
+
+
+def _resolve_addresses(host: str, port: int) -> List[Tuple[int, Tuple[Any, ...]]]:
+    """Return all ``(family, sockaddr)`` pairs for ``host:port`` in preference order.
+
+    Results are cached for ``_DNS_TTL`` seconds.
+    """
+    now = time.time()
+    entry = _DNS_CACHE.get((host, port))
+    if entry is not None and now - entry[0] < _DNS_TTL:
+        return entry[1]
+    infos = socket.getaddrinfo(host, port, socket.AF_UNSPEC, socket.SOCK_STREAM)
+    addresses = [(family, sockaddr) for family, _, _, _, sockaddr in infos]
+    _DNS_CACHE[(host, port)] = (now, addresses)
+    return addresses
+
+
+# Shared TLS context; loading the CA bundle is expensive, so it is
+# created on the first HTTPS request and reused afterwards
+_SSL_CTX: Optional[ssl.SSLContext] = None
+
+
+def _get_ssl_ctx() -> ssl.SSLContext:
+    """Return the shared client TLS context, creating it if needed."""
+    global _SSL_CTX
+    if _SSL_CTX is None:
+        _SSL_CTX = ssl.create_default_context()
+    return _SSL_CTX
+
+
+# Size of the scratch buffer that responses are received into
+_RECV_SIZE = 16384
+
+
+def _recv_head(sock: socket.socket, received: Optional[bytearray] = None) -> Tuple[bytes, bytearray]:
+    """Receive a response up to the blank line that ends its head.
+
+    ``received`` holds bytes of this response that were already read.
+    Returns the head bytes (status line and headers, without the final
+    blank line) and whatever body bytes arrived along with them.
+    """
+    buf = bytearray() if received is None else received
+    chunk = bytearray(_RECV_SIZE)
+    view = memoryview(chunk)
+    start = 0
+    while True:
+        end = buf.find(b"\r\n\r\n", start)
+        if end >= 0:
+            return bytes(buf[:end]), buf[end + 4:]
+        # The terminator may straddle two reads
+        start = max(0, len(buf) - 3)
+        n = sock.recv_into(chunk)
+        if not n:
+            return bytes(buf), bytearray()
+        buf += view[:n]
+
+
+def _is_interim_status(status: str) -> bool:
+    """Whether ``status`` is a 1xx interim code that precedes the real response.
+
+    101 Switching Protocols is final; it is never requested here anyway.
+    """
+    return status.startswith("1") and status != "101"
+
+
+def _recv_final_head(sock: socket.socket) -> Tuple[bytes, bytearray]:
+    """Like :func:`_recv_head`, but skip 1xx interim responses (e.g. 103 Early Hints)."""
+    head, received = _recv_head(sock)
+    while head:
+        status = head[:head.find(b"\r\n")].split(b" ", 2)[1:2]
+        if not status or not _is_interim_status(status[0].decode("latin-1")):
+            break
+        head, received = _recv_head(sock, received)
+    return head, received
+
+
+def _recv_body(sock: socket.socket, received: bytearray, length: Optional[int]) -> bytes:
+    """Receive the rest of a response body.
+
+    ``received`` holds the body bytes already read with the head. With a
+    known ``length`` exactly that many bytes are read (fewer if the peer
+    closes early); otherwise reading continues until EOF.
+    """
+    if length is not None:
+        if len(received) >= length:
+            return bytes(received[:length])
+        body = bytearray(length)
+        body[:len(received)] = received
+        view = memoryview(body)
+        got = len(received)
+        while got < length:
+            n = sock.recv_into(view[got:])
+            if not n:
+                break
+            got += n
+        return bytes(view[:got])
+    chunk = bytearray(_RECV_SIZE)
+    view = memoryview(chunk)
+    while True:
+        n = sock.recv_into(chunk)
+        if not n:
+            return bytes(received)
+        received += view[:n]
+
+
+def _recv_chunked(sock: socket.socket, received: bytearray) -> Tuple[bytes, bool]:
+    """Receive and decode a ``Transfer-Encoding: chunked`` body.
+
+    ``received`` holds the bytes already read with the head. Returns the
+    decoded body and whether the terminating zero-size chunk (and any
+    trailers) arrived before the peer closed the connection.
+    """
+    buf = received
+    pos = 0
+    body = bytearray()
+    chunk = bytearray(_RECV_SIZE)
+    view = memoryview(chunk)
+
+    def fill() -> bool:
+        n = sock.recv_into(chunk)
+        buf.extend(view[:n])
+        return n > 0
+
+    while True:
+        eol = buf.find(b"\r\n", pos)
+        if eol < 0:
+            if not fill():
+                return bytes(body), False
+            continue
+        # Chunk size in hex, optionally followed by ;extensions
+        semi = buf.find(b";", pos, eol)
+        size = int(buf[pos:eol if semi < 0 else semi], 16)
+        pos = eol + 2
+        if size == 0:
+            break
+        while len(buf) < pos + size + 2:
+            if not fill():
+                body += buf[pos:pos + size]
+                return bytes(body), False
+        body += buf[pos:pos + size]
+        pos += size + 2
+    # Skip trailer fields up to the final empty line
+    while True:
+        eol = buf.find(b"\r\n", pos)
+        if eol < 0:
+            if not fill():
+                return bytes(body), False
+            continue
+        if eol == pos:
+            return bytes(body), True
+        pos = eol + 2
+
+
+async def _read_chunked_async(reader: asyncio.StreamReader) -> bytes:
+    """Read and decode a chunked body from an asyncio stream."""
+    body = bytearray()
+    while True:
+        line = await reader.readline()
+        size = int(line.split(b";", 1)[0], 16)
+        if size == 0:
+            break
+        body += await reader.readexactly(size)
+        await reader.readline()
+    while (await reader.readline()) not in (b"\r\n", b""):
+        pass
+    return bytes(body)
+
+
+# Response headers: lower-cased name → value. "set-cookie" maps to the
+# list of individual Set-Cookie header values instead.
+Headers = Dict[str, Union[str, List[str]]]
+
+
+def _add_header_line(headers: Headers, line: str) -> None:
+    """Parse one ``Name: value`` response line into ``headers``.
+
+    Each ``Set-Cookie`` header is kept as a separate list entry; joining
+    them with commas would be ambiguous with the commas in Expires dates.
+    """
+    if ":" not in line:
+        return
+    k, v = line.split(":", 1)
+    k_lower = k.lower()
+    v = v.strip()
+    if k_lower == "set-cookie":
+        headers.setdefault(k_lower, []).append(v)  # type: ignore[union-attr]
+    else:
+        headers[k_lower] = v
+
+
+def _parse_set_cookie(cookie: str) -> Optional[Tuple[str, str, Dict[str, Any]]]:
+    """Parse a single Set-Cookie value into ``(name, value, params)``.
+
+    Scans the string once by index: ``;`` separates attributes and the
+    first ``=`` of each one separates key and value. Attribute keys are
+    lower-cased; values keep their case. Returns None when the leading
+    name=value pair is missing.
+    """
+    n = len(cookie)
+    semi = cookie.find(";")
+    if semi < 0:
+        semi = n
+    eq = cookie.find("=", 0, semi)
+    if eq < 0:
+        return None
+    name = cookie[:eq].strip()
+    value = cookie[eq + 1:semi].strip()
+    params: Dict[str, Any] = {}
+    pos = semi + 1
+    while pos < n:
+        semi = cookie.find(";", pos)
+        if semi < 0:
+            semi = n
+        eq = cookie.find("=", pos, semi)
+        if eq < 0:
+            key = cookie[pos:semi].strip()
+            if key:
+                params[key.lower()] = ""
+        else:
+            params[cookie[pos:eq].strip().lower()] = cookie[eq + 1:semi].strip()
+        pos = semi + 1
+    return name, value, params
+
+
+@functools.lru_cache(maxsize=256)
+def _referrer_origin(referrer: str) -> Optional[str]:
+    """Return the origin of a referrer URL string, or None if unparsable."""
+    try:
+        return URL(referrer).origin()
+    except Exception:
+        return None
+
+
+async def fetch_all(
+    urls: List["URL"],
+    referrer: Optional[Union[str, "URL"]] = None,
+    origin: Optional[str] = None,
+) -> List[Any]:
+    """Fetch ``urls`` concurrently with GET requests.
+
+    :returns: One entry per URL, in order: either the ``(headers, body)``
+              tuple or the exception raised while fetching that URL.
+    """
+    return await asyncio.gather(
+        *(u.request_async(referrer=referrer, origin=origin) for u in urls),
+        return_exceptions=True,
+    )
+
+
+def _url_part(slot: str) -> property:
+    """Property for a URL component stored in ``slot``."""
+    def fset(self: "URL", value: Any) -> None:
+        setattr(self, slot, value)
+        self._reset_derived()
+    return property(operator.attrgetter(slot), fset)
+
+
+# Supported schemes and their default ports
+_DEFAULT_PORTS: Dict[str, int] = {"http": 80, "https": 443}
 
 
 class URL:
@@ -30,36 +396,101 @@ class URL:
     and stored via the global :data:`COOKIE_JAR`.
     """
 
+    # URLs are created for every link and resource on a page
+    __slots__ = ("_scheme", "_host", "_port", "_path", "_origin", "_prefixes", "_str")
+
     def __init__(self, url: str) -> None:
-        # Split scheme and the rest of the URL
-        self.scheme, rest = url.split("://", 1)
-        assert self.scheme in ["http", "https"], f"Unsupported scheme: {self.scheme}"
-        # Ensure there's at least one '/' to separate host and path
-        if "/" not in rest:
-            rest += "/"
-        self.host, path = rest.split("/", 1)
-        self.path = "/" + path
-        # Default ports: 80 for HTTP, 443 for HTTPS
-        self.port = 80 if self.scheme == "http" else 443
-        # If host includes a port, parse it
-        if ":" in self.host:
-            self.host, p = self.host.split(":", 1)
-            self.port = int(p)
+        # Split scheme and the rest of the URL by index rather than with
+        # str.split, so no intermediate lists are built
+        i = url.find("://")
+        if i < 0:
+            raise ValueError(f"Missing scheme separator in URL: {url!r}")
+        scheme = url[:i]
+        # Validates the scheme and gives its default port in one lookup
+        default_port = _DEFAULT_PORTS.get(scheme)
+        if default_port is None:
+            raise ValueError(f"Unsupported scheme: {scheme}")
+        self._scheme = scheme
+        # The path starts at the first '/' after the host (default "/")
+        j = url.find("/", i + 3)
+        if j < 0:
+            host = url[i + 3:]
+            self._path = "/"
+        else:
+            host = url[i + 3:j]
+            self._path = url[j:]
+        # An explicit port follows the first ':' in the host
+        k = host.find(":")
+        if k < 0:
+            self._host = host
+            self._port = default_port
+        else:
+            self._host = host[:k]
+            self._port = int(host[k + 1:])
+        self._reset_derived()
+
+    def _reset_derived(self) -> None:
+        """Recompute the origin and drop the values cached from the components."""
+        self._origin = f"{self._scheme}://{self._host}:{self._port}"
+        # Encoded "<method> <path> ...\r\nHost: ...\r\n" prefixes for
+        # (GET, POST), built on the first request
+        self._prefixes: Optional[Tuple[bytes, bytes]] = None
+        # Canonical string form, built on the first str() call
+        self._str: Optional[str] = None
+
+    # The components read straight from their slots; assigning one
+    # resets the cached origin, request prefixes and string form
+    scheme = _url_part("_scheme")
+    host = _url_part("_host")
+    port = _url_part("_port")
+    path = _url_part("_path")
 
     def origin(self) -> str:
         """Return the origin (scheme://host:port) of this URL."""
-        return f"{self.scheme}://{self.host}:{self.port}"
+        return self._origin
+
+    def _connect(self) -> socket.socket:
+        """Open a new TCP (and, for https, TLS) connection to this URL's host."""
+        # Try each resolved address in turn, as socket.create_connection
+        # does, e.g. when "localhost" resolves to ::1 but the server only
+        # listens on IPv4. The address that worked is moved to the front.
+        addresses = _resolve_addresses(self.host, self.port)
+        error: Optional[OSError] = None
+        for i, (family, sockaddr) in enumerate(addresses):
+            sock = socket.socket(family, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+            try:
+                sock.connect(sockaddr)
+            except OSError as e:
+                sock.close()
+                error = e
+                continue
+            if i:
+                addresses.insert(0, addresses.pop(i))
+            break
+        else:
+            # The cached addresses may be stale; look them up again next time
+            _DNS_CACHE.pop((self.host, self.port), None)
+            raise error if error is not None else OSError(f"no addresses for {self.host}")
+        # Wrap with SSL if needed
+        if self.scheme == "https":
+            ctx = _get_ssl_ctx()
+            try:
+                sock = ctx.wrap_socket(sock, server_hostname=self.host)
+            except ssl.SSLError:
+                sock.close()
+                raise
+        return sock
 
     def request(
         self,
-        referrer: Optional[str] = None,
+        referrer: Optional[Union[str, "URL"]] = None,
         payload: Optional[str] = None,
         origin: Optional[str] = None,
         max_redirects: int = 5,
-    ) -> Tuple[Dict[str, str], str]:
+    ) -> Tuple[Headers, str]:
         """Make an HTTP or HTTPS request to this URL.
 
-        :param referrer: The Referer header value, if any.
+        :param referrer: The Referer header value (a string or URL), if any.
         :param payload: If provided, sends a POST with this body;
                         otherwise a GET request is made.
         :param origin: The Origin header value for CORS requests.
@@ -68,98 +499,36 @@ class URL:
         :raises ssl.SSLError: If SSL/TLS handshake fails.
         :raises Exception: For other network errors.
         """
-        # Establish a TCP connection
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP)
-        sock.connect((self.host, self.port))
-        # Wrap with SSL if needed
-        if self.scheme == "https":
-            ctx = ssl.create_default_context()
+        data = self._build_request(referrer, payload, origin, keep_alive=True)
+        # Send the request, preferring an idle pooled connection. A pooled
+        # socket may have been closed by the server in the meantime; in
+        # that case retry once on a fresh connection.
+        pool_key = (self.scheme, self.host, self.port)
+        sock = _pool_take(pool_key)
+        reused = sock is not None
+        while True:
+            if sock is None:
+                sock = self._connect()
             try:
-                sock = ctx.wrap_socket(sock, server_hostname=self.host)
-            except ssl.SSLError:
+                sock.sendall(data)
+                head, received = _recv_final_head(sock)
+                if not head:
+                    raise ConnectionError("connection closed before response")
+            except OSError:
                 sock.close()
-                raise
-        # Build HTTP request line and headers
-        method = "POST" if payload is not None else "GET"
-        req = f"{method} {self.path} HTTP/1.0\r\nHost: {self.host}\r\n"
-        # Referer header
-        if referrer:
-            req += f"Referer: {referrer}\r\n"
-        # Origin header for CORS
-        if origin:
-            req += f"Origin: {origin}\r\n"
-        # Send cookies from the jar
-        jar_key = self.origin()
-        cookies: list[str] = []
-        now = time.time()
-        jar = COOKIE_JAR.get(jar_key, {})
-        # Determine if this request is cross-site relative to the referrer
-        ref_origin = None
-        if referrer:
-            try:
-                ref_origin = URL(referrer).origin()
-            except Exception:
-                ref_origin = None
-        cross_site = ref_origin is not None and ref_origin != jar_key
-        remove_names: list[str] = []
-        for name, (value, params) in jar.items():
-            # Skip expired cookies
-            exp = params.get('expires')
-            if exp:
-                try:
-                    expires_ts = float(exp) if not isinstance(exp, (str, bytes)) else float(exp)
-                except Exception:
-                    try:
-                        dt = email.utils.parsedate_to_datetime(str(exp))
-                        expires_ts = dt.timestamp()
-                    except Exception:
-                        expires_ts = None
-                if expires_ts is not None and now > expires_ts:
-                    remove_names.append(name)
-                    continue
-            # SameSite=Lax cookies are not sent on cross-site POST requests
-            same_site = params.get('samesite', '').lower()
-            if same_site == 'lax' and method == 'POST' and cross_site:
+                if not reused:
+                    raise
+                sock, reused = None, False
                 continue
-            cookies.append(f"{name}={value}")
-        # Purge expired cookies
-        for n in remove_names:
-            jar.pop(n, None)
-        if cookies:
-            req += f"Cookie: {'; '.join(cookies)}\r\n"
-        # POST body headers
-        if payload is not None:
-            length = len(payload.encode("utf8"))
-            req += "Content-Type: application/x-www-form-urlencoded\r\n"
-            req += f"Content-Length: {length}\r\n"
-        # End of headers
-        req += "\r\n"
-        # Append body for POST
-        if payload is not None:
-            req += payload
-        # Send request
-        sock.send(req.encode("utf8"))
-        # Read response
-        resp = sock.makefile("r", encoding="utf8", newline="\r\n")
-        
+            break
+        # Decode the whole head at once; header bytes are latin-1
+        lines = head.decode("latin-1").split("\r\n")
         # Read status line to check for redirects
-        statusline = resp.readline()
-        version, status, explanation = statusline.split(" ", 2)
+        version, status, explanation = lines[0].split(" ", 2)
         
-        headers: Dict[str, str] = {}
-        while True:
-            line = resp.readline()
-            if line == "\r\n" or line == "":
-                break
-            if ":" not in line:
-                continue
-            k, v = line.split(":", 1)
-            k_lower = k.casefold()
-            v = v.strip()
-            if k_lower in headers and k_lower == "set-cookie":
-                headers[k_lower] += ", " + v
-            else:
-                headers[k_lower] = v
+        headers: Headers = {}
+        for line in lines[1:]:
+            _add_header_line(headers, line)
         
         # Handle Redirects (3xx)
         if status in ["301", "302", "303", "307", "308"] and "location" in headers and max_redirects > 0:
@@ -171,65 +540,192 @@ class URL:
             # Note: Browsers typically switch to GET for 301/302/303, so we pass payload=None
             return new_url.request(referrer, payload=None, origin=origin, max_redirects=max_redirects - 1)
 
-        # Body: no transfer encoding expected
-        body = resp.read()
-        sock.close()
-        
-        # Store cookies from Set-Cookie header
-        sc = headers.get("set-cookie")
-        if sc:
-            cookie_headers = [x.strip() for x in sc.split(",")]
-            for cookie_str in cookie_headers:
-                if not cookie_str:
-                    continue
-                parts = [p.strip() for p in cookie_str.split(";")]
-                if not parts:
-                    continue
-                name_value = parts[0]
-                if "=" not in name_value:
-                    continue
-                name, val = name_value.split("=", 1)
-                params: Dict[str, str] = {}
-                for part in parts[1:]:
-                    if not part:
-                        continue
-                    if "=" in part:
-                        k_p, v_p = part.split("=", 1)
-                        key = k_p.casefold()
-                        params[key] = v_p
-                    else:
-                        key = part.casefold()
-                        params[key] = ""
-                # Convert Expires to timestamp if possible
-                if 'expires' in params:
-                    exp_val = params['expires']
-                    try:
-                        dt = email.utils.parsedate_to_datetime(str(exp_val))
-                        params['expires'] = dt.timestamp()
-                    except Exception:
-                        pass
-                COOKIE_JAR.setdefault(jar_key, {})[name] = (val, params)
+        # Body. The connection can only be reused when the server keeps it
+        # open and the end of the body is known from the framing.
+        connection = headers.get("connection", "").lower()
+        if version.upper() == "HTTP/1.1":
+            keep_alive = connection != "close"
+        else:
+            keep_alive = connection == "keep-alive"
+        length = headers.get("content-length", "").strip()
+        if status in ("204", "304"):
+            # These responses never carry a body
+            raw = b""
+            if keep_alive:
+                _pool_put(pool_key, sock)
+            else:
+                sock.close()
+        elif "chunked" in headers.get("transfer-encoding", "").lower():
+            raw, complete = _recv_chunked(sock, received)
+            if keep_alive and complete:
+                _pool_put(pool_key, sock)
+            else:
+                sock.close()
+        elif keep_alive and length.isdigit():
+            raw = _recv_body(sock, received, int(length))
+            if len(raw) == int(length):
+                _pool_put(pool_key, sock)
+            else:
+                sock.close()
+        else:
+            raw = _recv_body(sock, received, None)
+            sock.close()
+        body = raw.decode("utf8")
+        self._store_cookies(headers)
         return headers, body
 
+    async def request_async(
+        self,
+        referrer: Optional[Union[str, "URL"]] = None,
+        payload: Optional[str] = None,
+        origin: Optional[str] = None,
+        max_redirects: int = 5,
+    ) -> Tuple[Headers, str]:
+        """Asynchronous counterpart of :meth:`request`.
+
+        Each call uses its own connection, closed afterwards, so that many
+        requests can be in flight at once on a single event loop. Cookies
+        are sent and stored exactly as in :meth:`request`.
+        """
+        data = self._build_request(referrer, payload, origin, keep_alive=False)
+        ctx = _get_ssl_ctx() if self.scheme == "https" else None
+        reader, writer = await asyncio.open_connection(
+            self.host, self.port, ssl=ctx, server_hostname=self.host if ctx else None
+        )
+        try:
+            writer.write(data)
+            await writer.drain()
+            while True:
+                statusline = (await reader.readline()).decode("latin-1")
+                version, status, explanation = statusline.split(" ", 2)
+                headers: Headers = {}
+                while True:
+                    line = (await reader.readline()).decode("latin-1")
+                    if line == "\r\n" or line == "":
+                        break
+                    _add_header_line(headers, line)
+                # Skip 1xx interim responses; the final one follows
+                if not _is_interim_status(status):
+                    break
+            redirect = status in ["301", "302", "303", "307", "308"] and "location" in headers and max_redirects > 0
+            if not redirect:
+                length = headers.get("content-length", "").strip()
+                if "chunked" in headers.get("transfer-encoding", "").lower():
+                    raw = await _read_chunked_async(reader)
+                else:
+                    raw = await (reader.readexactly(int(length)) if length.isdigit() else reader.read())
+        finally:
+            writer.close()
+        if redirect:
+            new_url = self.resolve(headers["location"])
+            return await new_url.request_async(referrer, payload=None, origin=origin, max_redirects=max_redirects - 1)
+        self._store_cookies(headers)
+        return headers, raw.decode("utf8")
+
+    def _build_request(
+        self,
+        referrer: Optional[Union[str, "URL"]],
+        payload: Optional[str],
+        origin: Optional[str],
+        keep_alive: bool,
+    ) -> bytes:
+        """Serialize the request line, headers (including cookies) and body."""
+        # Request line and Host header are fixed per URL; the variable
+        # headers are collected as bytes and joined once at the end
+        if self._prefixes is None:
+            tail = f" {self.path} HTTP/1.1\r\nHost: {self.host}\r\n".encode("utf8")
+            self._prefixes = (b"GET" + tail, b"POST" + tail)
+        method = "POST" if payload is not None else "GET"
+        parts = [self._prefixes[payload is not None]]
+        parts.append(b"Connection: keep-alive\r\n" if keep_alive else b"Connection: close\r\n")
+        # Referer header
+        if referrer:
+            parts.append(f"Referer: {referrer}\r\n".encode("utf8"))
+        # Origin header for CORS
+        if origin:
+            parts.append(f"Origin: {origin}\r\n".encode("utf8"))
+        # Send cookies from the jar. Expired cookies are dropped through the
+        # expiry heap, which is O(1) unless something actually expired.
+        jar_key = self.origin()
+        purge_expired_cookies(time.time())
+        jar = COOKIE_JAR.get(jar_key, {})
+        # Determine if this request is cross-site relative to the referrer
+        ref_origin = None
+        if isinstance(referrer, URL):
+            ref_origin = referrer.origin()
+        elif referrer:
+            ref_origin = _referrer_origin(referrer)
+        cross_site = ref_origin is not None and ref_origin != jar_key
+        # SameSite=Lax cookies are not sent on cross-site POST requests
+        check_lax = method == 'POST' and cross_site
+        # Write "name=value" pairs straight into the header in one pass
+        cookie_header = bytearray(b"Cookie: ")
+        empty = len(cookie_header)
+        for name, (value, params) in jar.items():
+            if check_lax and params.get('samesite', '').lower() == 'lax':
+                continue
+            if len(cookie_header) > empty:
+                cookie_header += b"; "
+            cookie_header += f"{name}={value}".encode("utf8")
+        if len(cookie_header) > empty:
+            cookie_header += b"\r\n"
+            parts.append(bytes(cookie_header))
+        # POST body headers, then the end of headers and the body
+        if payload is not None:
+            body = payload.encode("utf8")
+            parts.append(b"Content-Type: application/x-www-form-urlencoded\r\n")
+            parts.append(f"Content-Length: {len(body)}\r\n\r\n".encode("ascii"))
+            parts.append(body)
+        else:
+            parts.append(b"\r\n")
+        return b"".join(parts)
+
+    def _store_cookies(self, headers: Headers) -> None:
+        """Store cookies from the response's Set-Cookie headers."""
+        jar_key = self.origin()
+        for cookie_str in headers.get("set-cookie", ()):
+            parsed = _parse_set_cookie(cookie_str)
+            if parsed is None:
+                continue
+            name, val, params = parsed
+            # Convert Expires to timestamp if possible
+            if 'expires' in params:
+                exp_val = params['expires']
+                try:
+                    dt = email.utils.parsedate_to_datetime(str(exp_val))
+                    params['expires'] = dt.timestamp()
+                except Exception:
+                    pass
+            store_cookie(jar_key, name, val, params)
+
     def resolve(self, url: str) -> 'URL':
         """Resolve a relative or protocol-relative URL against this URL."""
-        if "://" in url:
+        # An empty reference is the document itself
+        if not url:
+            return self
+        # Decide by the first characters before scanning the whole string
+        if url[0] == "/":
+            if url[1:2] == "/":
+                return URL(self.scheme + ":" + url)
+        elif url.startswith(("http://", "https://")) or "://" in url:
             return URL(url)
-        if url.startswith("//"):
-            return URL(self.scheme + ":" + url)
-        if not url.startswith("/"):
-            dir_path, _ = self.path.rsplit("/", 1)
-            while url.startswith("../"):
-                _, url = url.split("/", 1)
-                if "/" in dir_path:
-                    dir_path, _ = dir_path.rsplit("/", 1)
-            url = dir_path + "/" + url
+        else:
+            # Walk "../" prefixes and parent directories by index; the
+            # directory never climbs above the root
+            path = self.path
+            dir_end = path.rfind("/")
+            i = 0
+            while url.startswith("../", i):
+                i += 3
+                k = path.rfind("/", 0, dir_end)
+                if k >= 0:
+                    dir_end = k
+            url = path[:dir_end] + "/" + url[i:]
         return URL(f"{self.scheme}://{self.host}:{self.port}{url}")
 
     def __str__(self) -> str:
-        show_port = (
-            (self.scheme == "http" and self.port != 80)
-            or (self.scheme == "https" and self.port != 443)
-        )
-        port = f":{self.port}" if show_port else ""
-        return f"{self.scheme}://{self.host}{port}{self.path}"
\ No newline at end of file
+        if self._str is None:
+            show_port = self.port != _DEFAULT_PORTS[self.scheme]
+            port = f":{self.port}" if show_port else ""
+            self._str = f"{self.scheme}://{self.host}{port}{self.path}"
+        return self._str
\ No newline at end of file
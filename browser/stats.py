@@ -1,29 +1,24 @@
 """
 stats.py
-Visualization module for the browser using Matplotlib and Pandas.
+Visualization module for the browser using Matplotlib.
 """
+import csv
 import os
-import pandas as pd
+from collections import Counter
 import matplotlib.pyplot as plt
 from urllib.parse import urlparse
 
 
 def show_history_stats(history_file: str = "browser_history.csv") -> None:
     """
-    Reads the browser history CSV using Pandas and displays a
-    bar chart of the top visited domains using Matplotlib.
+    Streams the browser history CSV and displays a bar chart of
+    the top visited domains using Matplotlib.
     """
     if not os.path.exists(history_file):
         print("No history file found. Browse some pages first!")
         return
 
     try:
-        df = pd.read_csv(history_file)
-
-        if df.empty or "url" not in df.columns:
-            print("History is empty or invalid.")
-            return
-
         def get_domain(url_str: str) -> str:
             try:
                 url_str = str(url_str)
@@ -33,12 +28,25 @@ def show_history_stats(history_file: str = "browser_history.csv") -> None:
             except Exception:
                 return "unknown"
 
-        df["domain"] = df["url"].apply(get_domain)
-
-        domain_counts = df["domain"].value_counts()
+        # Aggregate in a single pass; only the url column is needed, so
+        # there is no reason to materialize the whole file as a DataFrame
+        counts: Counter = Counter()
+        with open(history_file, newline="") as f:
+            reader = csv.DictReader(f)
+            if not reader.fieldnames or "url" not in reader.fieldnames:
+                print("History is empty or invalid.")
+                return
+            for row in reader:
+                counts[get_domain(row["url"])] += 1
+
+        if not counts:
+            print("History is empty or invalid.")
+            return
+        top_domains = counts.most_common(10)
 
         plt.figure(figsize=(10, 6))
-        domain_counts.head(10).plot(kind="bar")
+        names = [d for d, _ in top_domains]
+        plt.bar(names, [n for _, n in top_domains])
         plt.title("Top Visited Domains")
         plt.xlabel("Domain")
         plt.ylabel("Number of Visits")
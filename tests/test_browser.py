@@ -1,7 +1,16 @@
+import asyncio
+import socket
+import threading
+import time
+
 import pytest
-from browser.networking import URL
+from browser.networking import (
+    URL, COOKIE_JAR, _EXPIRY_HEAP, _add_header_line, _read_chunked_async, _recv_chunked,
+    _pool_put, _pool_take, purge_expired_cookies, store_cookie,
+)
 from browser.dom import HTMLParser, Element, Text
 from browser.css import CSSParser
+from browser.javascript import JSContext
 
 # --- Networking Tests ---
 
@@ -25,6 +34,32 @@ def test_url_creation():
     assert url3.host == "localhost"
     assert url3.port == 8080
 
+    # Explicit port without a path; only non-default ports are shown
+    url4 = URL("https://example.com:8443")
+    assert (url4.host, url4.port, url4.path) == ("example.com", 8443, "/")
+    assert str(url4) == "https://example.com:8443/"
+    assert str(URL("http://example.com:80/x")) == "http://example.com/x"
+
+    # Query and fragment stay part of the path
+    url5 = URL("http://example.com/search?q=a:b&page=2#results")
+    assert url5.host == "example.com"
+    assert url5.path == "/search?q=a:b&page=2#results"
+
+    # Missing or unsupported schemes are rejected
+    with pytest.raises(ValueError):
+        URL("example.com/index.html")
+    with pytest.raises(ValueError):
+        URL("ftp://example.com/")
+
+    # Assigning a component after construction updates the cached forms
+    url6 = URL("http://example.com/a")
+    assert str(url6) == "http://example.com/a"
+    url6.path = "/b"
+    url6.host = "other.com"
+    url6.port = 8000
+    assert str(url6) == "http://other.com:8000/b"
+    assert url6.origin() == "http://other.com:8000"
+
 def test_url_resolution():
     """Test resolving relative URLs against a base URL."""
     base = URL("http://example.com/dir/page.html")
@@ -45,6 +80,215 @@ def test_url_resolution():
     res4 = base.resolve("../style.css")
     assert str(res4) == "http://example.com/style.css"
 
+    # Protocol-relative URL keeps the scheme
+    assert str(base.resolve("//cdn.example.com/lib.js")) == "http://cdn.example.com/lib.js"
+
+    # ".." past the root stops at the root
+    assert str(base.resolve("../../../../top.css")) == "http://example.com/top.css"
+    assert str(URL("http://example.com/a/b/c/d.html").resolve("../../x")) == "http://example.com/a/x"
+
+    # Explicit ports carry over to relative URLs
+    assert str(URL("http://localhost:8000/dir/").resolve("page?x=1")) == "http://localhost:8000/dir/page?x=1"
+
+    # An empty reference is the URL itself
+    assert base.resolve("") is base
+
+def test_set_cookie_headers():
+    """Test that each Set-Cookie header is stored, even with commas in Expires."""
+    url = URL("http://cookies.example/")
+    headers = {}
+    _add_header_line(headers, "Set-Cookie: a=1; Path=/")
+    _add_header_line(headers, "Set-Cookie: b=2; Expires=Wed, 21 Oct 2037 07:28:00 GMT")
+    assert headers["set-cookie"] == ["a=1; Path=/", "b=2; Expires=Wed, 21 Oct 2037 07:28:00 GMT"]
+
+    url._store_cookies(headers)
+    jar = COOKIE_JAR[url.origin()]
+    assert jar["a"] == ("1", {"path": "/"})
+    assert jar["b"][0] == "2"
+    assert isinstance(jar["b"][1]["expires"], float)
+
+def test_cookie_expiry_heap():
+    """Test that overwriting cookies doesn't grow the expiry heap, and that purging covers all origins."""
+    a, b = "http://expiry-a.example:80", "http://expiry-b.example:80"
+
+    # Re-sending a cookie with the same expiry adds no heap entries
+    for _ in range(1000):
+        store_cookie(a, "session", "1", {"expires": 2000.0})
+    assert [e for e in _EXPIRY_HEAP if e[1] == a] == [(2000.0, a, "session")]
+
+    # The stale entry left by a changed expiry must not remove the cookie
+    store_cookie(a, "short", "1", {"expires": 1000.0})
+    store_cookie(a, "short", "2", {"expires": 5000.0})
+    store_cookie(b, "gone", "1", {"expires": 1500.0})
+    assert purge_expired_cookies(3000.0) == 5000.0
+    assert COOKIE_JAR[a] == {"short": ("2", {"expires": 5000.0})}
+    assert COOKIE_JAR[b] == {}
+
+    # Stale entries from changing expiries are compacted away
+    for i in range(1000):
+        store_cookie(a, "rolling", "1", {"expires": 10000.0 + i})
+    assert len([e for e in _EXPIRY_HEAP if e[1] == a]) < 200
+
+def _recv_chunked_from(received, *pieces):
+    """Run _recv_chunked on a socket fed ``pieces`` one send at a time, then closed."""
+    client, server = socket.socketpair()
+
+    def feed():
+        for piece in pieces:
+            server.sendall(piece)
+            time.sleep(0.01)
+        server.close()
+
+    sender = threading.Thread(target=feed)
+    sender.start()
+    try:
+        return _recv_chunked(client, bytearray(received))
+    finally:
+        sender.join()
+        client.close()
+
+def test_recv_chunked():
+    """Test decoding chunked bodies split across reads, with extensions, trailers and early EOF."""
+    # A chunk, its data and its CRLF split across the head and several reads
+    assert _recv_chunked_from(b"5\r\nhel", b"lo", b"\r", b"\n0\r\n\r\n") == (b"hello", True)
+
+    # Chunk extensions are ignored and trailer fields are skipped
+    body = b"3;name=value\r\nabc\r\n2\r\nde\r\n0\r\nX-Trailer: 1\r\n\r\n"
+    assert _recv_chunked_from(b"", body[:9], body[9:20], body[20:]) == (b"abcde", True)
+
+    # A stream that ends early returns what arrived, marked incomplete
+    assert _recv_chunked_from(b"", b"5\r\nhel") == (b"hel", False)
+    assert _recv_chunked_from(b"2\r\nab\r\n0\r\n") == (b"ab", False)
+
+    # The asyncio reader decodes the same framing
+    async def read_async():
+        reader = asyncio.StreamReader()
+        reader.feed_data(body)
+        reader.feed_eof()
+        return await _read_chunked_async(reader)
+
+    assert asyncio.run(read_async()) == b"abcde"
+
+def _serve_pooled(url, *responses):
+    """Put one end of a socketpair in the keep-alive pool for ``url``.
+
+    The other end answers each request with the next of ``responses`` and
+    then closes. Returns the list of raw requests received and the
+    serving thread.
+    """
+    client, server = socket.socketpair()
+    # Fail instead of hanging if a response is framed wrongly
+    client.settimeout(5)
+    server.settimeout(5)
+    _pool_put((url.scheme, url.host, url.port), client)
+    received = []
+
+    def serve():
+        with server:
+            for response in responses:
+                data = b""
+                while b"\r\n\r\n" not in data:
+                    piece = server.recv(4096)
+                    if not piece:
+                        return
+                    data += piece
+                received.append(data)
+                server.sendall(response)
+
+    thread = threading.Thread(target=serve)
+    thread.start()
+    return received, thread
+
+def _serve_once(response):
+    """Listen on a local port and answer one connection's request with ``response``.
+
+    Returns the URL of the listener and the serving thread.
+    """
+    listener = socket.socket()
+    listener.settimeout(5)
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(1)
+
+    def serve():
+        with listener:
+            conn, _ = listener.accept()
+            with conn:
+                data = b""
+                while b"\r\n\r\n" not in data:
+                    piece = conn.recv(4096)
+                    if not piece:
+                        return
+                    data += piece
+                conn.sendall(response)
+
+    thread = threading.Thread(target=serve)
+    thread.start()
+    return URL(f"http://127.0.0.1:{listener.getsockname()[1]}/"), thread
+
+def _drain_pool(url):
+    """Close and return the number of idle pooled connections for ``url``."""
+    count = 0
+    while (sock := _pool_take((url.scheme, url.host, url.port))) is not None:
+        sock.close()
+        count += 1
+    return count
+
+def test_request_skips_interim_responses():
+    """Test that 1xx interim responses are skipped instead of being taken as the final response."""
+    url = URL("http://pool.test/early")
+    _, server = _serve_pooled(
+        url,
+        b"HTTP/1.1 103 Early Hints\r\nLink: </s.css>\r\n\r\n"
+        b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\nfirst",
+        b"HTTP/1.1 200 OK\r\nContent-Length: 6\r\n\r\nsecond",
+    )
+    assert url.request()[1] == "first"
+    assert url.request()[1] == "second"
+    server.join()
+    _drain_pool(url)
+
+    # The asyncio path skips them too
+    url, thread = _serve_once(b"HTTP/1.1 100 Continue\r\n\r\nHTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\nfinal")
+    assert asyncio.run(url.request_async())[1] == "final"
+    thread.join()
+
+def test_keep_alive_pool():
+    """Test connection reuse, retry after a stale pooled socket, and which responses are pooled."""
+    # Two requests share one pooled connection; pool.test does not
+    # resolve, so a new connection could not have been opened
+    url = URL("http://pool.test/a")
+    requests, server = _serve_pooled(
+        url,
+        b"HTTP/1.1 200 OK\r\nContent-Length: 3\r\n\r\none",
+        b"HTTP/1.1 200 OK\r\nContent-Length: 3\r\n\r\ntwo",
+    )
+    assert url.request()[1] == "one"
+    assert url.request()[1] == "two"
+    server.join()
+    assert all(b"Connection: keep-alive\r\n" in r for r in requests) and len(requests) == 2
+    assert _drain_pool(url) == 1
+
+    # Connection: close and read-to-EOF responses are not pooled
+    _, server = _serve_pooled(url, b"HTTP/1.1 200 OK\r\nConnection: close\r\nContent-Length: 2\r\n\r\nok")
+    assert url.request()[1] == "ok"
+    server.join()
+    assert _drain_pool(url) == 0
+    _, server = _serve_pooled(url, b"HTTP/1.1 200 OK\r\n\r\nuntil eof")
+    assert url.request()[1] == "until eof"
+    server.join()
+    assert _drain_pool(url) == 0
+
+    # A pooled socket the server already closed is retried on a fresh
+    # connection
+    url, thread = _serve_once(b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\nfresh")
+    stale, peer = socket.socketpair()
+    peer.close()
+    _pool_put((url.scheme, url.host, url.port), stale)
+    assert url.request()[1] == "fresh"
+    thread.join()
+    assert stale.fileno() == -1
+    _drain_pool(url)
+
 
 # --- DOM Parsing Tests ---
 
@@ -88,6 +332,21 @@ def test_html_parser_attributes():
     assert div.attributes["id"] == "main"
     assert div.attributes["class"] == "container"
 
+def test_html_parser_fragment_reuse():
+    """Test parsing fragments with a reused parser (used by innerHTML)."""
+    parser = HTMLParser("<p>One</p>two")
+    body = parser.parse_fragment()
+
+    # Fragment children are returned directly, without <html>/<body> wrappers
+    assert body.tag == "body"
+    assert [getattr(c, "tag", None) for c in body.children] == ["p", None]
+    assert body.children[1].text == "two"
+
+    parser.reset("<i>x</i>")
+    body = parser.parse_fragment()
+    assert len(body.children) == 1
+    assert body.children[0].tag == "i"
+
 
 # --- CSS Parsing Tests ---
 
@@ -107,4 +366,106 @@ def test_css_parser():
     # Check second rule (p)
     selector, props = rules[1]
     assert selector.tag == "p"
-    assert props["color"] == "blue"
\ No newline at end of file
+    assert props["color"] == "blue"
+
+# --- JavaScript Tests ---
+
+class _ScriptTab:
+    """Minimal stand-in for a browser Tab: just what JSContext calls back into."""
+    def __init__(self, html):
+        self.nodes = HTMLParser(html).parse()
+        self.url = URL("http://example.com/index.html")
+        self.renders = 0
+
+    def process_scripts_and_styles(self):
+        pass
+
+    def apply_styles_and_render(self):
+        self.renders += 1
+
+    def allowed_request(self, url):
+        return True
+
+def test_js_runtime_runs_scripts():
+    """Test that the JavaScript runtime loads and scripts can use the DOM API."""
+    pytest.importorskip("dukpy")
+    tab = _ScriptTab('<div id="box"><a href="/one">one</a><a href="/two">two</a></div>')
+    js = JSContext(tab)
+    js.run("query.js", "var links = document.querySelectorAll('a');"
+                       "var hrefs = links[0].getAttribute('href') + ',' + links[1].getAttribute('href');")
+    assert js.interp.evaljs("links.length") == 2
+    assert js.interp.evaljs("hrefs") == "/one,/two"
+
+    # Assigning innerHTML replaces the element's children
+    js.run("inner.js", "document.querySelectorAll('div')[0].innerHTML = '<p>new</p>';")
+    div = tab.nodes.children[0].children[0]
+    assert [c.tag for c in div.children] == ["p"]
+    assert div.children[0].children[0].text == "new"
+
+    # Events dispatched from Python reach listeners, bubble, and can
+    # prevent the default action
+    js.run("events.js", "var seen = [];"
+                        "var p = document.querySelectorAll('p')[0];"
+                        "p.addEventListener('click', function(e) { seen.push('p'); e.preventDefault(); });"
+                        "document.querySelectorAll('div')[0].addEventListener('click', function(e) { seen.push('div'); });")
+    assert js.dispatch_event("click", div.children[0]) is True
+    assert js.interp.evaljs("seen.join(',')") == "p,div"
+
+def test_js_inner_html_round_trip():
+    """Test that reading innerHTML and writing it back leaves attribute values unchanged."""
+    pytest.importorskip("dukpy")
+    tab = _ScriptTab('<div><a href="/s?a=1&b=2" title="x&amp;y">q</a></div>')
+    js = JSContext(tab)
+    for _ in range(3):
+        js.run("round.js", "var d = document.querySelectorAll('div')[0]; d.innerHTML = d.innerHTML;")
+    link = tab.nodes.children[0].children[0].children[0]
+    assert link.attributes == {"href": "/s?a=1&b=2", "title": "x&amp;y"}
+
+def test_js_node_lookup_cache():
+    """Test that looking up a handle before it is registered doesn't cache the miss."""
+    pytest.importorskip("dukpy")
+    tab = _ScriptTab("<p>x</p>")
+    js = JSContext(tab)
+    p = tab.nodes.children[0].children[0]
+    next_handle = len(js.node_to_handle)
+    assert js._node(next_handle) is None
+    assert js.get_handle(p) == next_handle
+    assert js._node(next_handle) is p
+
+def test_js_inner_html_unchanged_skip():
+    """Test that reassigning the same innerHTML is skipped but any other markup is applied."""
+    pytest.importorskip("dukpy")
+    tab = _ScriptTab("<div></div>")
+    js = JSContext(tab)
+    js.run("set.js", "var d = document.querySelectorAll('div')[0]; d.innerHTML = '<b>1</b>';")
+    renders = tab.renders
+    js.run("same.js", "d.innerHTML = '<b>1</b>';")
+    assert tab.renders == renders
+    js.run("other.js", "d.innerHTML = '<i>2</i>';")
+    assert tab.renders == renders + 1
+    assert tab.nodes.children[0].children[0].children[0].tag == "i"
+
+def test_js_id_globals_track_dom_changes():
+    """Test that id globals follow removals and subtree moves, with duplicate ids in document order."""
+    pytest.importorskip("dukpy")
+    tab = _ScriptTab('<div id=w><p id=x>one</p><span id=x>two</span></div><div id=out></div>')
+    js = JSContext(tab)
+    js.update_ids()
+
+    def bound(name):
+        handle = js.interp.evaljs(f"typeof {name} === 'undefined' ? -1 : {name}.handle")
+        return None if handle == -1 else js.handle_to_node[handle].tag
+
+    # With duplicate ids the last element in document order is bound, and
+    # removing it falls back to the other one
+    assert bound("x") == "span"
+    js.run("remove.js", "w.removeChild(x);")
+    assert bound("x") == "p"
+
+    # Moving a subtree out of the document unbinds its ids; moving it
+    # back in binds them again
+    js.run("detach.js", "var moved = w; document.createElement('div').appendChild(moved);")
+    assert bound("w") is None and bound("x") is None
+    assert bound("out") == "div"
+    js.run("attach.js", "out.appendChild(moved);")
+    assert bound("w") == "div" and bound("x") == "p"